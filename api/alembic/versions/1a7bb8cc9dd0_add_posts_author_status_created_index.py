@@ -0,0 +1,28 @@
+"""Add (author_id, status, created_at, id) index on posts
+
+Revision ID: 1a7bb8cc9dd0
+Revises: ff6aa7bb8cc9
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '1a7bb8cc9dd0'
+down_revision: Union[str, None] = 'ff6aa7bb8cc9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A user's active posts, newest first, without sorting all of their posts
+    op.create_index(
+        'ix_posts_author_status_created_id', 'posts',
+        ['author_id', 'status', 'created_at', 'id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_posts_author_status_created_id', table_name='posts')
@@ -0,0 +1,28 @@
+"""Add (user_id, session_id) index on chat_members
+
+Revision ID: 2b8cc9dd0ee1
+Revises: 1a7bb8cc9dd0
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '2b8cc9dd0ee1'
+down_revision: Union[str, None] = '1a7bb8cc9dd0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # get_dm_session intersects the two users' session ids; this serves each side
+    # as an index-only range scan
+    op.create_index(
+        'ix_chat_members_user_session', 'chat_members', ['user_id', 'session_id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_chat_members_user_session', table_name='chat_members')
@@ -0,0 +1,43 @@
+"""Add messages indexes and widen the interaction pair index with created_at
+
+Revision ID: 3c9dd0ee1ff2
+Revises: 2b8cc9dd0ee1
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '3c9dd0ee1ff2'
+down_revision: Union[str, None] = '2b8cc9dd0ee1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # messages had no index beyond its primary key; chat previews and the DM
+    # permission counts all filter on session_id
+    op.create_index('ix_messages_session_created', 'messages', ['session_id', 'created_at'])
+    op.create_index('ix_messages_session_sender', 'messages', ['session_id', 'sender_id'])
+
+    # Adding created_at lets windowed pair counts stay in the index.
+    # The interaction_logs table comes from create_all, so tolerate either index state.
+    op.create_index(
+        'ix_interaction_actor_target_created', 'interaction_logs',
+        ['actor_id', 'target_user_id', 'created_at'], if_not_exists=True,
+    )
+    op.drop_index('ix_interaction_actor_target', table_name='interaction_logs', if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index(
+        'ix_interaction_actor_target', 'interaction_logs',
+        ['actor_id', 'target_user_id'], if_not_exists=True,
+    )
+    op.drop_index(
+        'ix_interaction_actor_target_created', table_name='interaction_logs', if_exists=True,
+    )
+    op.drop_index('ix_messages_session_sender', table_name='messages')
+    op.drop_index('ix_messages_session_created', table_name='messages')
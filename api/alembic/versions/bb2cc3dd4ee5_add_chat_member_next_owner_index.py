@@ -0,0 +1,32 @@
+"""Add partial expression index for group owner succession
+
+Revision ID: bb2cc3dd4ee5
+Revises: aa1bb2cc3dd4
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = 'bb2cc3dd4ee5'
+down_revision: Union[str, None] = 'aa1bb2cc3dd4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Lets leave_group pick the next owner (first admin, else first member by
+    # join date) with an index scan + LIMIT 1 instead of sorting all members.
+    op.execute(
+        """
+        CREATE INDEX ix_chat_members_next_owner
+        ON chat_members (session_id, (CASE WHEN role = 'admin' THEN 0 ELSE 1 END), joined_at)
+        WHERE left_at IS NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_chat_members_next_owner', table_name='chat_members')
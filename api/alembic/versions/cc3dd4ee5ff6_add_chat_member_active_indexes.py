@@ -0,0 +1,36 @@
+"""Add partial indexes on active chat memberships
+
+Revision ID: cc3dd4ee5ff6
+Revises: bb2cc3dd4ee5
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'cc3dd4ee5ff6'
+down_revision: Union[str, None] = 'bb2cc3dd4ee5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Membership checks and active-member listings all filter on left_at IS NULL;
+    # indexing only active rows keeps them small as members leave over time.
+    op.create_index(
+        'ix_chat_members_active', 'chat_members', ['session_id', 'user_id'],
+        postgresql_where=sa.text('left_at IS NULL'),
+    )
+    # Admin lookups (e.g. notifying admins of join requests)
+    op.create_index(
+        'ix_chat_members_active_role', 'chat_members', ['session_id', 'role'],
+        postgresql_where=sa.text('left_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_chat_members_active_role', table_name='chat_members')
+    op.drop_index('ix_chat_members_active', table_name='chat_members')
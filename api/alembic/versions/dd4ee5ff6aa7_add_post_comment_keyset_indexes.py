@@ -0,0 +1,30 @@
+"""Add keyset pagination indexes on posts and comments
+
+Revision ID: dd4ee5ff6aa7
+Revises: cc3dd4ee5ff6
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = 'dd4ee5ff6aa7'
+down_revision: Union[str, None] = 'cc3dd4ee5ff6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Post lists page with (created_at, id) < cursor, newest first
+    op.create_index('ix_posts_created_id', 'posts', ['created_at', 'id'])
+    # Comment threads page with (created_at, id) > cursor within one post
+    op.create_index(
+        'ix_comments_post_created_id', 'comments', ['post_id', 'created_at', 'id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_comments_post_created_id', table_name='comments')
+    op.drop_index('ix_posts_created_id', table_name='posts')
@@ -0,0 +1,29 @@
+"""Add lower(handle) prefix-search index on users
+
+Revision ID: ee5ff6aa7bb8
+Revises: dd4ee5ff6aa7
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'ee5ff6aa7bb8'
+down_revision: Union[str, None] = 'dd4ee5ff6aa7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # User search is lower(handle) LIKE 'prefix%'; the plain unique index on handle can't serve it
+    op.create_index(
+        'ix_users_handle_lower', 'users',
+        [sa.text('lower(handle) text_pattern_ops')],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_handle_lower', table_name='users')
@@ -0,0 +1,33 @@
+"""Cover ledger amount in the (user_id, created_at) index
+
+Revision ID: ff6aa7bb8cc9
+Revises: ee5ff6aa7bb8
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = 'ff6aa7bb8cc9'
+down_revision: Union[str, None] = 'ee5ff6aa7bb8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # get_balance sums amount over the user's last 24h; INCLUDE lets that be an index-only scan.
+    # The ledger table comes from create_all, so tolerate either index state.
+    op.create_index(
+        'ix_ledger_user_created_amount', 'ledger', ['user_id', 'created_at'],
+        postgresql_include=['amount'], if_not_exists=True,
+    )
+    op.drop_index('ix_ledger_user_created', table_name='ledger', if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index(
+        'ix_ledger_user_created', 'ledger', ['user_id', 'created_at'], if_not_exists=True,
+    )
+    op.drop_index('ix_ledger_user_created_amount', table_name='ledger', if_exists=True)
@@ -13,6 +13,8 @@ engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     pool_pre_ping=True,
+    # Room for the lambda_stmt variants of the hot post/comment reads on top of everything else
+    query_cache_size=1200,
 )
 
 async_session = async_sessionmaker(
@@ -6,6 +6,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.db.database import init_db
 from app.routes import posts, users, chat, drafts, pay, settlement, media, auth, reports, ai_admin
 from app.services.media import media_service
+from app.services.ws_manager import manager
+from app.services.interaction_log_service import interaction_log_writer
+from app.services.pay_client import close_pay_client
 
 
 @asynccontextmanager
@@ -13,7 +16,11 @@ async def lifespan(app: FastAPI):
     """Initialize and cleanup resources."""
     await init_db()
     media_service.create_buckets()
+    interaction_log_writer.start()
     yield
+    await interaction_log_writer.stop()
+    await manager.stop()
+    await close_pay_client()
 
 
 app = FastAPI(
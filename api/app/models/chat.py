@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import String, Integer, ForeignKey, DateTime, Text, Boolean
+from sqlalchemy import String, Integer, ForeignKey, DateTime, Text, Boolean, Index, literal_column, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
@@ -48,6 +48,11 @@ class ChatSession(Base):
     )
 
 
+# Owner succession order when a group owner leaves: admins first, then members.
+# Kept as literal SQL (no bind params) so queries match ix_chat_members_next_owner.
+SUCCESSION_RANK = literal_column("CASE WHEN role = 'admin' THEN 0 ELSE 1 END")
+
+
 class ChatMember(Base):
     """Membership in a chat session."""
 
@@ -83,6 +88,27 @@ class ChatMember(Base):
     # Relationships
     session: Mapped['ChatSession'] = relationship('ChatSession', back_populates='members')
 
+    __table_args__ = (
+        # Every hot path filters on active membership (left_at IS NULL)
+        Index(
+            'ix_chat_members_active',
+            'session_id', 'user_id',
+            postgresql_where=text('left_at IS NULL'),
+        ),
+        Index(
+            'ix_chat_members_active_role',
+            'session_id', 'role',
+            postgresql_where=text('left_at IS NULL'),
+        ),
+        Index(
+            'ix_chat_members_next_owner',
+            'session_id', SUCCESSION_RANK, 'joined_at',
+            postgresql_where=text('left_at IS NULL'),
+        ),
+        # DM lookup: each user's sessions, including ones they have left
+        Index('ix_chat_members_user_session', 'user_id', 'session_id'),
+    )
+
 
 class Message(Base):
     """Chat message."""
@@ -127,6 +153,13 @@ class Message(Base):
         'MessageReaction', back_populates='message', cascade='all, delete-orphan'
     )
 
+    __table_args__ = (
+        # Last message per session: session_id = ? ORDER BY created_at DESC LIMIT 1
+        Index('ix_messages_session_created', 'session_id', 'created_at'),
+        # DM permission counts: messages by / not by the initiator in a session
+        Index('ix_messages_session_sender', 'session_id', 'sender_id'),
+    )
+
 
 class MessageReaction(Base):
     """Emoji reaction on a message."""
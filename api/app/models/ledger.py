@@ -94,5 +94,9 @@ class Ledger(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
     __table_args__ = (
-        Index('ix_ledger_user_created', 'user_id', 'created_at'),
+        # Covers history paging and the 24h net-change sum (index-only via INCLUDE amount)
+        Index(
+            'ix_ledger_user_created_amount', 'user_id', 'created_at',
+            postgresql_include=['amount'],
+        ),
     )
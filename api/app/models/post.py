@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import String, Integer, BigInteger, ForeignKey, DateTime, Text, UniqueConstraint, Float, Boolean, JSON
+from sqlalchemy import String, Integer, BigInteger, ForeignKey, DateTime, Text, UniqueConstraint, Float, Boolean, JSON, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
@@ -86,6 +86,13 @@ class Post(Base):
         'Comment', back_populates='post', cascade='all, delete-orphan'
     )
 
+    __table_args__ = (
+        # Keyset pagination: ORDER BY created_at DESC, id DESC
+        Index('ix_posts_created_id', 'created_at', 'id'),
+        # Profile lists: author_id = ? AND status = 'active', same ordering, LIMIT stops early
+        Index('ix_posts_author_status_created_id', 'author_id', 'status', 'created_at', 'id'),
+    )
+
 
 class Comment(Base):
     """Comment on a post. Also used as answers for questions."""
@@ -134,6 +141,11 @@ class Comment(Base):
         'Comment', back_populates='replies', remote_side=[id]
     )
 
+    __table_args__ = (
+        # Keyset pagination within a post: ORDER BY created_at, id
+        Index('ix_comments_post_created_id', 'post_id', 'created_at', 'id'),
+    )
+
 
 class PostLike(Base):
     """Tracks who liked which post with full weight components."""
@@ -32,7 +32,8 @@ class InteractionLog(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
     __table_args__ = (
-        Index('ix_interaction_actor_target', 'actor_id', 'target_user_id'),
+        # Pair lookups within a time window (novelty: actor -> target since cutoff)
+        Index('ix_interaction_actor_target_created', 'actor_id', 'target_user_id', 'created_at'),
         Index('ix_interaction_created', 'created_at'),
     )
 
@@ -1,5 +1,5 @@
 from datetime import datetime, date
-from sqlalchemy import String, Integer, ForeignKey, DateTime, UniqueConstraint, BigInteger, Boolean, JSON, Date
+from sqlalchemy import String, Integer, ForeignKey, DateTime, UniqueConstraint, BigInteger, Boolean, JSON, Date, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
@@ -85,6 +85,15 @@ class User(Base):
         'UserAuthProvider', back_populates='user', cascade='all, delete-orphan'
     )
 
+    __table_args__ = (
+        # search_users matches lower(handle) LIKE 'prefix%'; text_pattern_ops lets a btree serve it
+        Index(
+            'ix_users_handle_lower',
+            func.lower(handle).label('handle_lower'),
+            postgresql_ops={'handle_lower': 'text_pattern_ops'},
+        ),
+    )
+
 
 class Follow(Base):
     """Follow relationship between users."""
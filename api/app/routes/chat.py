@@ -1,16 +1,22 @@
 import json
+import logging
 import secrets
 from datetime import datetime as dt, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, WebSocket, WebSocketDisconnect
-from pydantic import BaseModel, Field
-from sqlalchemy import select, desc, func, and_, or_, case
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, WebSocket, WebSocketDisconnect
+from pydantic import BaseModel, Field, TypeAdapter
+from sqlalchemy import Integer, select, update, desc, func, and_, or_, case, any_, literal
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.db.database import get_db
 from app.models.user import User, Follow
-from app.models.chat import ChatSession, ChatMember, Message, MessageReaction, GroupInviteLink, JoinRequest, MessageTransfer
+from app.models.chat import (
+    ChatSession, ChatMember, Message, MessageReaction, GroupInviteLink, JoinRequest, MessageTransfer,
+    SUCCESSION_RANK,
+)
 from app.models.ledger import ActionType, RefType
 from app.schemas.chat import (
     ChatSessionCreate, ChatSessionResponse, ChatSessionUpdate, MessageCreate, MessageResponse,
@@ -41,6 +47,13 @@ async def get_member_role(db: AsyncSession, session_id: int, user_id: int) -> st
     return member.role if member else None
 
 
+def _check_role(member: ChatMember, min_role: str) -> None:
+    """Raise 403 unless member has at least min_role."""
+    role_order = {'owner': 3, 'admin': 2, 'member': 1}
+    if role_order.get(member.role, 0) < role_order.get(min_role, 0):
+        raise HTTPException(status_code=403, detail=f'Requires {min_role} or higher')
+
+
 async def require_role(db: AsyncSession, session_id: int, user_id: int, min_role: str) -> ChatMember:
     """Require user to have at least min_role. Returns membership if valid."""
     result = await db.execute(
@@ -56,13 +69,55 @@ async def require_role(db: AsyncSession, session_id: int, user_id: int, min_role
     if not member:
         raise HTTPException(status_code=403, detail='Not a member of this chat')
 
-    role_order = {'owner': 3, 'admin': 2, 'member': 1}
-    if role_order.get(member.role, 0) < role_order.get(min_role, 0):
-        raise HTTPException(status_code=403, detail=f'Requires {min_role} or higher')
-
+    _check_role(member, min_role)
     return member
 
 
+async def require_role_and_session(
+    db: AsyncSession, session_id: int, user_id: int, min_role: str
+) -> tuple[ChatMember, ChatSession]:
+    """Like require_role, but loads the session in the same query.
+
+    Returns (membership, session).
+    """
+    result = await db.execute(
+        select(ChatMember, ChatSession)
+        .join(ChatSession, ChatSession.id == ChatMember.session_id)
+        .where(
+            and_(
+                ChatMember.session_id == session_id,
+                ChatMember.user_id == user_id,
+                ChatMember.left_at == None
+            )
+        )
+    )
+    row = result.first()
+    if not row:
+        raise HTTPException(status_code=403, detail='Not a member of this chat')
+
+    member, session = row
+    _check_role(member, min_role)
+    return member, session
+
+
+async def require_group_role(
+    db: AsyncSession, session_id: int, user_id: int, min_role: str
+) -> tuple[ChatMember, ChatSession]:
+    """require_role_and_session for group-only endpoints. Raises 404 for non-groups."""
+    member, session = await require_role_and_session(db, session_id, user_id, min_role)
+    if not session.is_group:
+        raise HTTPException(status_code=404, detail='Group not found')
+    return member, session
+
+
+async def lock_session_membership(db: AsyncSession, session_id: int) -> None:
+    """Serialize membership changes for a session until the transaction ends.
+
+    Take this before counting members so concurrent joins can't overshoot member_limit.
+    """
+    await db.execute(select(func.pg_advisory_xact_lock(session_id)))
+
+
 async def create_system_message(db: AsyncSession, session_id: int, content: str, visible_to: int | None = None):
     """Create a system message and broadcast it."""
     msg = Message(
@@ -75,15 +130,14 @@ async def create_system_message(db: AsyncSession, session_id: int, content: str,
     )
     db.add(msg)
     await db.flush()
-    await db.refresh(msg)
 
     # Broadcast to all members
     members_result = await db.execute(
-        select(ChatMember).where(
+        select(ChatMember.user_id).where(
             and_(ChatMember.session_id == session_id, ChatMember.left_at == None)
         )
     )
-    member_ids = [m.user_id for m in members_result.scalars().all()]
+    member_ids = list(members_result.scalars().all())
     if visible_to:
         member_ids = [visible_to]
 
@@ -104,6 +158,15 @@ async def create_system_message(db: AsyncSession, session_id: int, content: str,
     )
     return msg
 
+def _any_id(ids):
+    """`= ANY($1::int[])` operand for an id list.
+
+    One array parameter keeps the SQL text identical whatever len(ids) is, so
+    asyncpg's prepared-statement cache gets hits instead of one entry per list size.
+    """
+    return any_(literal(list(ids), ARRAY(Integer)))
+
+
 def _preview_text(msg: Message | None) -> str | None:
     """Friendly chat-list preview text for the latest message in a session."""
     if msg is None:
@@ -125,7 +188,7 @@ async def _load_transfer_map(db: AsyncSession, message_ids: list[int]) -> dict[i
     if not message_ids:
         return {}
     result = await db.execute(
-        select(MessageTransfer).where(MessageTransfer.message_id.in_(message_ids))
+        select(MessageTransfer).where(MessageTransfer.message_id == _any_id(message_ids))
     )
     return {t.message_id: t for t in result.scalars().all()}
 
@@ -144,7 +207,15 @@ def _transfer_info(t: MessageTransfer | None) -> TransferInfo | None:
     )
 
 
+INVITE_CODE_ATTEMPTS = 3
+
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# List endpoints dump through these adapters and return the bytes directly, skipping
+# response_model revalidation; response_model stays on the routes for the OpenAPI schema
+_session_list_adapter = TypeAdapter(list[ChatSessionResponse])
+_message_list_adapter = TypeAdapter(list[MessageResponse])
 
 
 @router.get('/permission')
@@ -178,10 +249,10 @@ async def create_session(
     if not creator:
         raise HTTPException(status_code=404, detail='Creator not found')
 
-    for member_id in all_member_ids:
-        user = await db.get(User, member_id)
-        if not user:
-            raise HTTPException(status_code=404, detail=f'User {member_id} not found')
+    found_result = await db.execute(select(User.id).where(User.id == _any_id(all_member_ids)))
+    missing_ids = all_member_ids - set(found_result.scalars().all())
+    if missing_ids:
+        raise HTTPException(status_code=404, detail=f'User {min(missing_ids)} not found')
 
     is_group = session_data.is_group or len(all_member_ids) > 2
 
@@ -253,9 +324,12 @@ async def get_sessions(
         ChatSession.owner_id == user_id,
     )
 
+    # The caller's membership comes back with each session, and every session's
+    # members load in one selectin query, instead of get_session() per row
     result = await db.execute(
-        select(ChatSession)
+        select(ChatSession, ChatMember)
         .join(ChatMember)
+        .options(selectinload(ChatSession.members))
         .where(
             and_(
                 ChatMember.user_id == user_id,
@@ -266,13 +340,28 @@ async def get_sessions(
         .limit(limit)
         .offset(offset)
     )
-    sessions = result.scalars().all()
+    rows = result.all()
+
+    # Users behind every active member of every listed session, in one query
+    member_ids = {m.user_id for session, _ in rows for m in session.members if m.left_at is None}
+    users_result = await db.execute(select(User).where(User.id == _any_id(list(member_ids))))
+    users = {u.id: u for u in users_result.scalars().all()}
+
+    active_ids = [session.id for session, membership in rows if membership.left_at is None]
+    previews = await _active_previews(db, active_ids, user_id)
 
     responses = []
-    for session in sessions:
-        responses.append(await get_session(session.id, user_id, db))
+    for session, membership in rows:
+        members = [users[m.user_id] for m in session.members if m.left_at is None and m.user_id in users]
+        if membership.left_at is None:
+            last_msg, unread_count = previews.get(session.id, (None, 0))
+        else:
+            last_msg, unread_count = await _session_preview(db, session.id, user_id, membership)
+        responses.append(
+            _session_response(session, members, last_msg, unread_count, membership.left_at is not None)
+        )
 
-    return responses
+    return Response(content=_session_list_adapter.dump_json(responses), media_type='application/json')
 
 
 @router.get('/sessions/{session_id}', response_model=ChatSessionResponse)
@@ -310,89 +399,124 @@ async def get_session(
     # Get active member users only (not left)
     active_members = [m for m in session.members if m.left_at is None]
     member_ids = [m.user_id for m in active_members]
-    members_result = await db.execute(select(User).where(User.id.in_(member_ids)))
+    members_result = await db.execute(select(User).where(User.id == _any_id(member_ids)))
     members = members_result.scalars().all()
 
-    # For users who have left, get the last message they can see (before or at left_at)
-    # Also include system messages visible_to them
-    if user_has_left:
-        # Get the last message visible to this user (either visible_to them or before they left)
-        last_msg_result = await db.execute(
-            select(Message)
-            .where(
-                and_(
-                    Message.session_id == session_id,
-                    Message.status == 'sent',
-                    ((Message.visible_to == None) & (Message.created_at <= user_membership_record.left_at)) |
-                    (Message.visible_to == user_id)
-                )
-            )
-            .order_by(desc(Message.created_at))
-            .limit(1)
-        )
-        last_msg = last_msg_result.scalar_one_or_none()
-        unread_count = 0  # No unread for users who left
-    else:
-        # Get last message (text + image messages visible to this user)
-        last_msg_result = await db.execute(
-            select(Message)
-            .where(
-                and_(
-                    Message.session_id == session_id,
-                    Message.message_type.in_(['text', 'image', 'transfer']),
-                    Message.status == 'sent',
-                    (Message.visible_to == None) | (Message.visible_to == user_id)
-                )
+    last_msg, unread_count = await _session_preview(db, session_id, user_id, user_membership_record)
+
+    return _session_response(session, members, last_msg, unread_count, user_has_left)
+
+
+async def _session_preview(
+    db: AsyncSession, session_id: int, user_id: int, membership: ChatMember
+) -> tuple[Message | None, int]:
+    """Last message and unread count for the chat list, for current or former members."""
+    if membership.left_at is None:
+        return await _last_message_and_unread(db, session_id, user_id, membership)
+
+    # For users who have left, get the last message they can see: sent before
+    # they left, or a system message visible_to them
+    last_msg_result = await db.execute(
+        select(Message)
+        .where(
+            and_(
+                Message.session_id == session_id,
+                Message.status == 'sent',
+                ((Message.visible_to == None) & (Message.created_at <= membership.left_at)) |
+                (Message.visible_to == user_id)
             )
-            .order_by(desc(Message.created_at))
-            .limit(1)
         )
-        last_msg = last_msg_result.scalar_one_or_none()
+        .order_by(desc(Message.created_at))
+        .limit(1)
+    )
+    return last_msg_result.scalar_one_or_none(), 0  # No unread for users who left
+
 
-        # Get unread count (text + image + transfer messages visible to this user)
-        user_membership = next((m for m in session.members if m.user_id == user_id and m.left_at is None), None)
-        unread_count = 0
-        visibility_filter = and_(
-            Message.session_id == session_id,
-            Message.message_type.in_(['text', 'image', 'transfer']),
-            Message.status == 'sent',
+async def _last_message_and_unread(
+    db: AsyncSession, session_id: int, user_id: int, membership: ChatMember | None
+) -> tuple[Message | None, int]:
+    """Latest visible message and unread count for an active member, in one query."""
+    visible = and_(
+        Message.session_id == session_id,
+        Message.message_type.in_(['text', 'image', 'transfer']),
+        Message.status == 'sent',
+        (Message.visible_to == None) | (Message.visible_to == user_id)
+    )
+    # Unread = visible messages from others after the read marker (never read = all).
+    # No correlation: the count scans its own messages, not the outer row
+    last_read_id = (membership.last_read_message_id if membership else None) or 0
+    unread = (
+        select(func.count())
+        .select_from(Message)
+        .where(visible, Message.sender_id != user_id, Message.id > last_read_id)
+        .correlate(None)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        select(Message, unread)
+        .where(visible)
+        .order_by(desc(Message.created_at))
+        .limit(1)
+    )
+    # No visible message means nothing can be unread either
+    row = result.first()
+    if row is None:
+        return None, 0
+    return row[0], row[1] or 0
+
+
+async def _active_previews(
+    db: AsyncSession, session_ids: list[int], user_id: int
+) -> dict[int, tuple[Message | None, int]]:
+    """Last message and unread count for many sessions the user is still in, in two grouped queries."""
+    if not session_ids:
+        return {}
+    visible = and_(
+        Message.session_id == _any_id(session_ids),
+        Message.message_type.in_(['text', 'image', 'transfer']),
+        Message.status == 'sent',
+        (Message.visible_to == None) | (Message.visible_to == user_id)
+    )
+    last_result = await db.execute(
+        select(Message)
+        .where(visible)
+        .order_by(Message.session_id, desc(Message.created_at))
+        .distinct(Message.session_id)
+    )
+    # Read markers come from the caller's membership row in each session
+    unread_result = await db.execute(
+        select(Message.session_id, func.count())
+        .join(
+            ChatMember,
+            and_(ChatMember.session_id == Message.session_id, ChatMember.user_id == user_id),
+        )
+        .where(
+            visible,
             Message.sender_id != user_id,
-            (Message.visible_to == None) | (Message.visible_to == user_id)
+            Message.id > func.coalesce(ChatMember.last_read_message_id, 0),
         )
-        if user_membership and user_membership.last_read_message_id:
-            unread_result = await db.scalar(
-                select(func.count()).where(
-                    and_(
-                        visibility_filter,
-                        Message.id > user_membership.last_read_message_id,
-                    )
-                )
-            )
-            unread_count = unread_result or 0
-        elif last_msg:
-            # Never read = count all visible text messages (excluding own)
-            unread_result = await db.scalar(
-                select(func.count()).where(visibility_filter)
-            )
-            unread_count = unread_result or 0
+        .group_by(Message.session_id)
+    )
+    unread = dict(unread_result.all())
+    return {msg.session_id: (msg, unread.get(msg.session_id, 0)) for msg in last_result.scalars().all()}
+
 
-    return ChatSessionResponse(
+def _session_response(
+    session: ChatSession,
+    members: list[User],
+    last_msg: Message | None,
+    unread_count: int,
+    user_has_left: bool,
+) -> ChatSessionResponse:
+    # Built from loaded rows only, so skip validation
+    return ChatSessionResponse.model_construct(
         id=session.id,
         name=session.name,
         is_group=session.is_group,
         avatar=session.avatar,
         description=session.description,
         owner_id=session.owner_id,
-        members=[
-            UserBrief(
-                id=m.id,
-                name=m.name,
-                handle=m.handle,
-                avatar=m.avatar,
-                trust_score=m.trust_score,
-            )
-            for m in members
-        ],
+        members=[UserBrief.from_orm_public(m) for m in members],
         last_message=_preview_text(last_msg) if last_msg else None,
         last_message_at=last_msg.created_at if last_msg else None,
         unread_count=unread_count,
@@ -414,27 +538,12 @@ async def send_message(
 ):
     """Send a message to a chat session. Returns list of messages (user msg + optional system msg)."""
     # Verify sender is active member (not left)
-    membership_result = await db.execute(
-        select(ChatMember).where(
-            and_(
-                ChatMember.session_id == session_id,
-                ChatMember.user_id == sender_id,
-                ChatMember.left_at == None
-            )
-        )
-    )
-    membership = membership_result.scalar_one_or_none()
-    if not membership:
-        raise HTTPException(status_code=403, detail='Not a member of this chat')
+    membership, session = await require_role_and_session(db, session_id, sender_id, 'member')
 
     sender = await db.get(User, sender_id)
     if not sender:
         raise HTTPException(status_code=404, detail='Sender not found')
 
-    session = await db.get(ChatSession, session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail='Session not found')
-
     # Group-specific checks
     if session.is_group:
         # Check if muted
@@ -511,7 +620,6 @@ async def send_message(
     )
     db.add(message)
     await db.flush()
-    await db.refresh(message)
 
     session.updated_at = dt.utcnow()
 
@@ -543,9 +651,9 @@ async def send_message(
         member_ids = [m.user_id for m in members] if not session.is_group else []
         if session.is_group:
             members_result = await db.execute(
-                select(ChatMember).where(ChatMember.session_id == session_id)
+                select(ChatMember.user_id).where(ChatMember.session_id == session_id)
             )
-            member_ids = [m.user_id for m in members_result.scalars().all()]
+            member_ids = list(members_result.scalars().all())
         await manager.broadcast_to_session(
             member_ids,
             {'type': 'new_message', 'message': user_msg_response.model_dump(mode='json')},
@@ -564,7 +672,6 @@ async def send_message(
         )
         db.add(system_msg)
         await db.flush()
-        await db.refresh(system_msg)
 
         system_response = MessageResponse(
             id=system_msg.id,
@@ -615,21 +722,7 @@ async def send_sat_transfer(
     writes ledger rows on both sides, posts a 'transfer' message into the
     chat session, and broadcasts via WebSocket.
     """
-    sender_membership = await db.execute(
-        select(ChatMember).where(
-            and_(
-                ChatMember.session_id == session_id,
-                ChatMember.user_id == sender_id,
-                ChatMember.left_at == None,
-            )
-        )
-    )
-    if not sender_membership.scalar_one_or_none():
-        raise HTTPException(status_code=403, detail='Not a member of this chat')
-
-    session = await db.get(ChatSession, session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail='Session not found')
+    _, session = await require_role_and_session(db, session_id, sender_id, 'member')
     if session.is_group:
         raise HTTPException(status_code=400, detail='SAT transfers are only supported in 1:1 chats')
 
@@ -687,7 +780,6 @@ async def send_sat_transfer(
     )
     db.add(message)
     await db.flush()
-    await db.refresh(message)
 
     transfer = MessageTransfer(
         message_id=message.id,
@@ -702,8 +794,6 @@ async def send_sat_transfer(
 
     session.updated_at = dt.utcnow()
     await db.commit()
-    await db.refresh(message)
-    await db.refresh(transfer)
 
     response = MessageResponse(
         id=message.id,
@@ -743,11 +833,11 @@ async def _broadcast_transfer_update(
 ):
     """Send a `transfer_updated` event to both participants of the chat."""
     members_result = await db.execute(
-        select(ChatMember).where(
+        select(ChatMember.user_id).where(
             and_(ChatMember.session_id == session_id, ChatMember.left_at == None)
         )
     )
-    member_ids = [m.user_id for m in members_result.scalars().all()]
+    member_ids = list(members_result.scalars().all())
     payload = MessageResponse(
         id=message.id,
         session_id=message.session_id,
@@ -816,7 +906,6 @@ async def accept_sat_transfer(
     transfer.accepted_at = dt.utcnow()
     await db.flush()
     await db.commit()
-    await db.refresh(transfer)
 
     await _broadcast_transfer_update(db, message.session_id, message, transfer, sender)
 
@@ -882,7 +971,6 @@ async def decline_sat_transfer(
     transfer.refunded_at = dt.utcnow()
     await db.flush()
     await db.commit()
-    await db.refresh(transfer)
 
     await _broadcast_transfer_update(db, message.session_id, message, transfer, sender)
 
@@ -968,8 +1056,11 @@ async def get_messages(
     sender_ids = list(set(m.sender_id for m in messages))
     if not sender_ids:
         return []
-    senders_result = await db.execute(select(User).where(User.id.in_(sender_ids)))
-    senders = {u.id: u for u in senders_result.scalars().all()}
+    # Only the UserBrief columns; full User rows aren't needed to label messages
+    senders_result = await db.execute(
+        select(User.id, User.name, User.handle, User.avatar).where(User.id == _any_id(sender_ids))
+    )
+    senders = {u.id: u for u in senders_result.all()}
 
     # Mark as read (update last_read_message_id) - count sent text/image/transfer messages
     sent_messages = [m for m in messages if m.status == 'sent' and m.message_type in ('text', 'image', 'transfer')]
@@ -987,7 +1078,7 @@ async def get_messages(
     reactions_result = await db.execute(
         select(MessageReaction, User)
         .join(User, MessageReaction.user_id == User.id)
-        .where(MessageReaction.message_id.in_(message_ids))
+        .where(MessageReaction.message_id == _any_id(message_ids))
     )
     reactions_data = reactions_result.all()
     
@@ -1007,7 +1098,7 @@ async def get_messages(
         reply_msgs_result = await db.execute(
             select(Message, User)
             .join(User, Message.sender_id == User.id)
-            .where(Message.id.in_(reply_to_ids))
+            .where(Message.id == _any_id(reply_to_ids))
         )
         for reply_msg, reply_sender in reply_msgs_result.all():
             replies_by_id[reply_msg.id] = ReplyInfo(
@@ -1021,18 +1112,14 @@ async def get_messages(
     transfer_msg_ids = [m.id for m in messages if m.message_type == 'transfer']
     transfer_map = await _load_transfer_map(db, transfer_msg_ids)
 
-    return [
-        MessageResponse(
+    # Everything below comes straight from the DB, so build with model_construct and
+    # dump once instead of validating every message (and again via response_model)
+    responses = [
+        MessageResponse.model_construct(
             id=m.id,
             session_id=m.session_id,
             sender_id=m.sender_id,
-            sender=UserBrief(
-                id=senders[m.sender_id].id,
-                name=senders[m.sender_id].name,
-                handle=senders[m.sender_id].handle,
-                avatar=senders[m.sender_id].avatar,
-                trust_score=senders[m.sender_id].trust_score,
-            ),
+            sender=UserBrief.from_orm_public(senders[m.sender_id]),
             content=m.content,
             media_url=m.media_url,
             message_type=m.message_type,
@@ -1045,6 +1132,7 @@ async def get_messages(
         for m in messages
         if m.sender_id in senders
     ]
+    return Response(content=_message_list_adapter.dump_json(responses), media_type='application/json')
 
 
 @router.post('/messages/{message_id}/reactions', response_model=ReactionResponse, status_code=status.HTTP_201_CREATED)
@@ -1085,9 +1173,9 @@ async def add_reaction(
     existing_reaction = existing.scalar_one_or_none()
 
     members_result = await db.execute(
-        select(ChatMember).where(ChatMember.session_id == message.session_id)
+        select(ChatMember.user_id).where(ChatMember.session_id == message.session_id)
     )
-    member_ids = [m.user_id for m in members_result.scalars().all()]
+    member_ids = list(members_result.scalars().all())
 
     if existing_reaction:
         await db.delete(existing_reaction)
@@ -1119,7 +1207,6 @@ async def add_reaction(
     )
     db.add(reaction)
     await db.flush()
-    await db.refresh(reaction)
 
     # Broadcast to others only (sender uses optimistic update)
     await manager.broadcast_to_session(
@@ -1173,9 +1260,9 @@ async def remove_reaction(
 
     # Broadcast removal
     members_result = await db.execute(
-        select(ChatMember).where(ChatMember.session_id == message.session_id)
+        select(ChatMember.user_id).where(ChatMember.session_id == message.session_id)
     )
-    member_ids = [m.user_id for m in members_result.scalars().all()]
+    member_ids = list(members_result.scalars().all())
     await manager.broadcast_to_session(
         member_ids,
         {
@@ -1198,11 +1285,7 @@ async def get_group_detail(
     db: AsyncSession = Depends(get_db),
 ):
     """Get detailed group info with full member list and roles."""
-    membership = await require_role(db, session_id, user_id, 'member')
-
-    session = await db.get(ChatSession, session_id)
-    if not session or not session.is_group:
-        raise HTTPException(status_code=404, detail='Group not found')
+    membership, session = await require_group_role(db, session_id, user_id, 'member')
 
     # Get all active members with user info
     members_result = await db.execute(
@@ -1264,11 +1347,7 @@ async def update_group(
     db: AsyncSession = Depends(get_db),
 ):
     """Update group settings (admin+ only)."""
-    await require_role(db, session_id, user_id, 'admin')
-
-    session = await db.get(ChatSession, session_id)
-    if not session or not session.is_group:
-        raise HTTPException(status_code=404, detail='Group not found')
+    membership, session = await require_group_role(db, session_id, user_id, 'admin')
 
     user = await db.get(User, user_id)
     changes = []
@@ -1299,17 +1378,21 @@ async def update_group(
 
     # Broadcast group_updated event
     members_result = await db.execute(
-        select(ChatMember).where(
+        select(User)
+        .join(ChatMember, ChatMember.user_id == User.id)
+        .where(
             and_(ChatMember.session_id == session_id, ChatMember.left_at == None)
         )
     )
-    member_ids = [m.user_id for m in members_result.scalars().all()]
+    members = members_result.scalars().all()
     await manager.broadcast_to_session(
-        member_ids,
+        [m.id for m in members],
         {'type': 'group_updated', 'session_id': session_id}
     )
 
-    return await get_session(session_id, user_id, db)
+    # Build the response from what we already hold instead of re-running get_session
+    last_msg, unread_count = await _last_message_and_unread(db, session_id, user_id, membership)
+    return _session_response(session, members, last_msg, unread_count, user_has_left=False)
 
 
 @router.delete('/sessions/{session_id}')
@@ -1319,19 +1402,15 @@ async def delete_group(
     db: AsyncSession = Depends(get_db),
 ):
     """Delete a group (owner only)."""
-    await require_role(db, session_id, user_id, 'owner')
-
-    session = await db.get(ChatSession, session_id)
-    if not session or not session.is_group:
-        raise HTTPException(status_code=404, detail='Group not found')
+    _, session = await require_group_role(db, session_id, user_id, 'owner')
 
     # Broadcast deletion to all members before deleting
     members_result = await db.execute(
-        select(ChatMember).where(
+        select(ChatMember.user_id).where(
             and_(ChatMember.session_id == session_id, ChatMember.left_at == None)
         )
     )
-    member_ids = [m.user_id for m in members_result.scalars().all()]
+    member_ids = list(members_result.scalars().all())
     await manager.broadcast_to_session(
         member_ids,
         {'type': 'group_deleted', 'session_id': session_id}
@@ -1352,17 +1431,14 @@ async def add_members(
     db: AsyncSession = Depends(get_db),
 ):
     """Add members to a group."""
-    membership = await require_role(db, session_id, user_id, 'member')
-
-    session = await db.get(ChatSession, session_id)
-    if not session or not session.is_group:
-        raise HTTPException(status_code=404, detail='Group not found')
+    membership, session = await require_group_role(db, session_id, user_id, 'member')
 
     # Check permission based on group settings
     if session.who_can_add == 'admins_only' and membership.role == 'member':
         raise HTTPException(status_code=403, detail='Only admins can add members')
 
     # Check member limit
+    await lock_session_membership(db, session_id)
     current_count = await db.scalar(
         select(func.count()).where(
             and_(ChatMember.session_id == session_id, ChatMember.left_at == None)
@@ -1375,19 +1451,23 @@ async def add_members(
     added_names = []
     rejoined_user_ids = []
 
-    for new_user_id in request.user_ids:
-        # Check if user exists
-        user = await db.get(User, new_user_id)
-        if not user:
-            continue
-
-        # Check if already a member
-        existing = await db.execute(
-            select(ChatMember).where(
-                and_(ChatMember.session_id == session_id, ChatMember.user_id == new_user_id)
-            )
+    # Every invitee and any membership they already have here, in one query
+    # instead of a user lookup plus a membership lookup per invitee
+    invitees_result = await db.execute(
+        select(User, ChatMember)
+        .outerjoin(
+            ChatMember,
+            and_(ChatMember.session_id == session_id, ChatMember.user_id == User.id),
         )
-        existing_member = existing.scalar_one_or_none()
+        .where(User.id == _any_id(request.user_ids))
+    )
+    invitees = {user.id: (user, existing_member) for user, existing_member in invitees_result}
+
+    for new_user_id in dict.fromkeys(request.user_ids):
+        # Skip users that don't exist
+        if new_user_id not in invitees:
+            continue
+        user, existing_member = invitees[new_user_id]
 
         if existing_member:
             if existing_member.left_at:
@@ -1425,11 +1505,11 @@ async def add_members(
 
         # Broadcast to all members
         members_result = await db.execute(
-            select(ChatMember).where(
+            select(ChatMember.user_id).where(
                 and_(ChatMember.session_id == session_id, ChatMember.left_at == None)
             )
         )
-        member_ids = [m.user_id for m in members_result.scalars().all()]
+        member_ids = list(members_result.scalars().all())
         await manager.broadcast_to_session(
             member_ids,
             {'type': 'members_added', 'session_id': session_id, 'count': len(added_names)}
@@ -1446,39 +1526,32 @@ async def remove_member(
     db: AsyncSession = Depends(get_db),
 ):
     """Remove a member from a group (admin+ only, cannot remove owner)."""
-    await require_role(db, session_id, user_id, 'admin')
-
-    session = await db.get(ChatSession, session_id)
-    if not session or not session.is_group:
-        raise HTTPException(status_code=404, detail='Group not found')
+    membership, session = await require_group_role(db, session_id, user_id, 'admin')
 
     # Cannot remove owner
     if target_user_id == session.owner_id:
         raise HTTPException(status_code=403, detail='Cannot remove the group owner')
 
-    # Find target membership
-    target_result = await db.execute(
-        select(ChatMember).where(
-            and_(
-                ChatMember.session_id == session_id,
-                ChatMember.user_id == target_user_id,
-                ChatMember.left_at == None
-            )
-        )
-    )
-    target_member = target_result.scalar_one_or_none()
-    if not target_member:
+    # Soft delete in a single UPDATE. Admins cannot remove other admins (only owner can).
+    target_filter = [
+        ChatMember.session_id == session_id,
+        ChatMember.user_id == target_user_id,
+        ChatMember.left_at == None,
+    ]
+    if membership.role != 'owner':
+        target_filter.append(ChatMember.role != 'admin')
+    removed_id = await db.scalar(
+        update(ChatMember)
+        .where(and_(*target_filter))
+        .values(left_at=dt.utcnow())
+        .returning(ChatMember.id)
+    )
+    if removed_id is None:
+        # Nothing updated: work out why (only on the error path)
+        if await get_member_role(db, session_id, target_user_id) == 'admin':
+            raise HTTPException(status_code=403, detail='Only owner can remove admins')
         raise HTTPException(status_code=404, detail='Member not found')
 
-    # Admins cannot remove other admins (only owner can)
-    my_role = await get_member_role(db, session_id, user_id)
-    if target_member.role == 'admin' and my_role != 'owner':
-        raise HTTPException(status_code=403, detail='Only owner can remove admins')
-
-    # Soft delete
-    target_member.left_at = dt.utcnow()
-    await db.flush()
-
     remover = await db.get(User, user_id)
     target_user = await db.get(User, target_user_id)
     
@@ -1490,11 +1563,11 @@ async def remove_member(
 
     # Broadcast to all remaining members
     members_result = await db.execute(
-        select(ChatMember).where(
+        select(ChatMember.user_id).where(
             and_(ChatMember.session_id == session_id, ChatMember.left_at == None)
         )
     )
-    member_ids = [m.user_id for m in members_result.scalars().all()]
+    member_ids = list(members_result.scalars().all())
     await manager.broadcast_to_session(
         member_ids,
         {'type': 'member_removed', 'session_id': session_id, 'user_id': target_user_id}
@@ -1516,19 +1589,15 @@ async def leave_group(
     db: AsyncSession = Depends(get_db),
 ):
     """Leave a group chat."""
-    membership = await require_role(db, session_id, user_id, 'member')
-
-    session = await db.get(ChatSession, session_id)
-    if not session or not session.is_group:
-        raise HTTPException(status_code=404, detail='Group not found')
+    membership, session = await require_group_role(db, session_id, user_id, 'member')
 
     user = await db.get(User, user_id)
 
     # If owner is leaving, transfer ownership
     if membership.role == 'owner':
         # Find next owner: first admin by join date, or first member
-        next_owner_result = await db.execute(
-            select(ChatMember)
+        next_owner_id = await db.scalar(
+            select(ChatMember.user_id)
             .where(
                 and_(
                     ChatMember.session_id == session_id,
@@ -1536,19 +1605,26 @@ async def leave_group(
                     ChatMember.left_at == None
                 )
             )
-            .order_by(
-                case((ChatMember.role == 'admin', 0), else_=1),
-                ChatMember.joined_at
-            )
+            # Served by ix_chat_members_next_owner: index scan + LIMIT 1, no sort
+            .order_by(SUCCESSION_RANK, ChatMember.joined_at)
             .limit(1)
         )
-        next_owner = next_owner_result.scalar_one_or_none()
 
-        if next_owner:
+        if next_owner_id:
             # Transfer ownership
-            next_owner.role = 'owner'
-            session.owner_id = next_owner.user_id
-            new_owner_user = await db.get(User, next_owner.user_id)
+            await db.execute(
+                update(ChatMember)
+                .where(
+                    and_(
+                        ChatMember.session_id == session_id,
+                        ChatMember.user_id == next_owner_id,
+                        ChatMember.left_at == None
+                    )
+                )
+                .values(role='owner')
+            )
+            session.owner_id = next_owner_id
+            new_owner_user = await db.get(User, next_owner_id)
             await create_system_message(
                 db, session_id,
                 f'{user.name} left. {new_owner_user.name} is now the owner'
@@ -1560,18 +1636,19 @@ async def leave_group(
             return {'status': 'group_deleted'}
 
     # Soft delete membership
-    membership.left_at = dt.utcnow()
-    await db.flush()
+    await db.execute(
+        update(ChatMember).where(ChatMember.id == membership.id).values(left_at=dt.utcnow())
+    )
 
     await create_system_message(db, session_id, f'{user.name} left the group')
 
     # Broadcast
     members_result = await db.execute(
-        select(ChatMember).where(
+        select(ChatMember.user_id).where(
             and_(ChatMember.session_id == session_id, ChatMember.left_at == None)
         )
     )
-    member_ids = [m.user_id for m in members_result.scalars().all()]
+    member_ids = list(members_result.scalars().all())
     await manager.broadcast_to_session(
         member_ids,
         {'type': 'member_left', 'session_id': session_id, 'user_id': user_id}
@@ -1589,10 +1666,9 @@ async def update_member_role(
     db: AsyncSession = Depends(get_db),
 ):
     """Promote/demote a member (owner only)."""
-    await require_role(db, session_id, user_id, 'owner')
+    _, session = await require_role_and_session(db, session_id, user_id, 'owner')
 
     # Cannot change owner's role
-    session = await db.get(ChatSession, session_id)
     if target_user_id == session.owner_id:
         raise HTTPException(status_code=400, detail='Cannot change owner role. Use transfer instead.')
 
@@ -1624,11 +1700,11 @@ async def update_member_role(
 
     # Broadcast
     members_result = await db.execute(
-        select(ChatMember).where(
+        select(ChatMember.user_id).where(
             and_(ChatMember.session_id == session_id, ChatMember.left_at == None)
         )
     )
-    member_ids = [m.user_id for m in members_result.scalars().all()]
+    member_ids = list(members_result.scalars().all())
     await manager.broadcast_to_session(
         member_ids,
         {'type': 'role_changed', 'session_id': session_id, 'user_id': target_user_id, 'role': request.role}
@@ -1646,9 +1722,8 @@ async def mute_member(
     db: AsyncSession = Depends(get_db),
 ):
     """Mute/unmute a member (admin+ only)."""
-    await require_role(db, session_id, user_id, 'admin')
+    _, session = await require_role_and_session(db, session_id, user_id, 'admin')
 
-    session = await db.get(ChatSession, session_id)
     if target_user_id == session.owner_id:
         raise HTTPException(status_code=403, detail='Cannot mute the owner')
 
@@ -1691,41 +1766,29 @@ async def transfer_ownership(
     db: AsyncSession = Depends(get_db),
 ):
     """Transfer group ownership (owner only)."""
-    await require_role(db, session_id, user_id, 'owner')
+    membership, session = await require_group_role(db, session_id, user_id, 'owner')
 
-    session = await db.get(ChatSession, session_id)
-    if not session or not session.is_group:
-        raise HTTPException(status_code=404, detail='Group not found')
-
-    # Find new owner membership
-    new_owner_result = await db.execute(
-        select(ChatMember).where(
+    # Promote new owner (the UPDATE doubles as the membership check)
+    new_owner_member_id = await db.scalar(
+        update(ChatMember)
+        .where(
             and_(
                 ChatMember.session_id == session_id,
                 ChatMember.user_id == request.new_owner_id,
                 ChatMember.left_at == None
             )
         )
+        .values(role='owner')
+        .returning(ChatMember.id)
     )
-    new_owner_member = new_owner_result.scalar_one_or_none()
-    if not new_owner_member:
+    if new_owner_member_id is None:
         raise HTTPException(status_code=404, detail='New owner must be a group member')
 
-    # Find current owner membership
-    current_owner_result = await db.execute(
-        select(ChatMember).where(
-            and_(
-                ChatMember.session_id == session_id,
-                ChatMember.user_id == user_id,
-                ChatMember.left_at == None
-            )
+    # Demote current owner
+    if new_owner_member_id != membership.id:
+        await db.execute(
+            update(ChatMember).where(ChatMember.id == membership.id).values(role='admin')
         )
-    )
-    current_owner_member = current_owner_result.scalar_one_or_none()
-
-    # Transfer
-    current_owner_member.role = 'admin'
-    new_owner_member.role = 'owner'
     session.owner_id = request.new_owner_id
     await db.flush()
 
@@ -1738,11 +1801,11 @@ async def transfer_ownership(
 
     # Broadcast
     members_result = await db.execute(
-        select(ChatMember).where(
+        select(ChatMember.user_id).where(
             and_(ChatMember.session_id == session_id, ChatMember.left_at == None)
         )
     )
-    member_ids = [m.user_id for m in members_result.scalars().all()]
+    member_ids = list(members_result.scalars().all())
     await manager.broadcast_to_session(
         member_ids,
         {'type': 'ownership_transferred', 'session_id': session_id, 'new_owner_id': request.new_owner_id}
@@ -1761,29 +1824,29 @@ async def create_invite_link(
     db: AsyncSession = Depends(get_db),
 ):
     """Create an invite link for a group (admin+ only)."""
-    await require_role(db, session_id, user_id, 'admin')
-
-    session = await db.get(ChatSession, session_id)
-    if not session or not session.is_group:
-        raise HTTPException(status_code=404, detail='Group not found')
-
-    # Generate unique code
-    code = secrets.token_urlsafe(8)[:10]
+    await require_group_role(db, session_id, user_id, 'admin')
 
     expires_at = None
     if request.expires_in_days:
         expires_at = dt.utcnow() + timedelta(days=request.expires_in_days)
 
-    link = GroupInviteLink(
-        session_id=session_id,
-        created_by=user_id,
-        code=code,
-        expires_at=expires_at,
-        max_uses=request.max_uses,
-    )
-    db.add(link)
-    await db.flush()
-    await db.refresh(link)
+    # Fixed-length 12-char hex code; the unique index on code catches the
+    # (astronomically rare) collision, in which case we retry with a new one.
+    for attempt in range(INVITE_CODE_ATTEMPTS):
+        link = GroupInviteLink(
+            session_id=session_id,
+            created_by=user_id,
+            code=secrets.token_hex(6),
+            expires_at=expires_at,
+            max_uses=request.max_uses,
+        )
+        try:
+            async with db.begin_nested():
+                db.add(link)
+            break
+        except IntegrityError:
+            if attempt == INVITE_CODE_ATTEMPTS - 1:
+                raise
 
     return InviteLinkResponse(
         id=link.id,
@@ -1968,7 +2031,7 @@ async def join_via_invite(
 
         # Notify admins via WebSocket
         admins_result = await db.execute(
-            select(ChatMember).where(
+            select(ChatMember.user_id).where(
                 and_(
                     ChatMember.session_id == link.session_id,
                     ChatMember.role.in_(['owner', 'admin']),
@@ -1976,7 +2039,7 @@ async def join_via_invite(
                 )
             )
         )
-        admin_ids = [m.user_id for m in admins_result.scalars().all()]
+        admin_ids = list(admins_result.scalars().all())
         await manager.broadcast_to_session(
             admin_ids,
             {'type': 'join_request', 'session_id': link.session_id, 'user_id': user_id, 'user_name': user.name}
@@ -1985,6 +2048,7 @@ async def join_via_invite(
         return {'status': 'pending', 'session_id': link.session_id}
 
     # No approval needed - join directly
+    await lock_session_membership(db, link.session_id)
     member_count = await db.scalar(
         select(func.count()).where(
             and_(ChatMember.session_id == link.session_id, ChatMember.left_at == None)
@@ -2006,11 +2070,11 @@ async def join_via_invite(
 
     # Broadcast
     members_result = await db.execute(
-        select(ChatMember).where(
+        select(ChatMember.user_id).where(
             and_(ChatMember.session_id == link.session_id, ChatMember.left_at == None)
         )
     )
-    member_ids = [m.user_id for m in members_result.scalars().all()]
+    member_ids = list(members_result.scalars().all())
     await manager.broadcast_to_session(
         member_ids,
         {'type': 'member_joined', 'session_id': link.session_id, 'user_id': user_id}
@@ -2071,7 +2135,7 @@ async def handle_join_request(
     db: AsyncSession = Depends(get_db),
 ):
     """Approve or reject a join request (admin+ only)."""
-    await require_role(db, session_id, user_id, 'admin')
+    _, session = await require_role_and_session(db, session_id, user_id, 'admin')
 
     join_request = await db.get(JoinRequest, request_id)
     if not join_request or join_request.session_id != session_id:
@@ -2080,12 +2144,12 @@ async def handle_join_request(
     if join_request.status != 'pending':
         raise HTTPException(status_code=400, detail='Request already processed')
 
-    session = await db.get(ChatSession, session_id)
     requester = await db.get(User, join_request.user_id)
     admin = await db.get(User, user_id)
 
     if action_data.action == 'approve':
         # Check member limit
+        await lock_session_membership(db, session_id)
         member_count = await db.scalar(
             select(func.count()).where(
                 and_(ChatMember.session_id == session_id, ChatMember.left_at == None)
@@ -2123,11 +2187,11 @@ async def handle_join_request(
 
         # Broadcast to all members
         members_result = await db.execute(
-            select(ChatMember).where(
+            select(ChatMember.user_id).where(
                 and_(ChatMember.session_id == session_id, ChatMember.left_at == None)
             )
         )
-        member_ids = [m.user_id for m in members_result.scalars().all()]
+        member_ids = list(members_result.scalars().all())
         await manager.broadcast_to_session(
             member_ids,
             {'type': 'member_joined', 'session_id': session_id, 'user_id': join_request.user_id}
@@ -2165,11 +2229,11 @@ async def websocket_endpoint(websocket: WebSocket, user_id: int):
             # Wait for any message (text, ping, etc.) to keep connection alive
             message = await websocket.receive()
             # Handle text messages if needed (typing indicators, etc.)
-            if message.get('type') == 'websocket.disconnect':
+            if message['type'] == 'websocket.disconnect':
                 break
     except WebSocketDisconnect:
         pass
-    except Exception as e:
-        print(f'[WS] Error for user {user_id}: {e}')
+    except Exception:
+        logger.exception('WebSocket error for user %d', user_id)
     finally:
         manager.disconnect(websocket, user_id)
@@ -38,18 +38,17 @@ async def create_draft(
     if not user:
         raise HTTPException(status_code=404, detail='User not found')
     
-    count_result = await db.execute(
+    # Make room for the new draft: drop everything past the newest MAX - 1 in
+    # one statement instead of fetching every id to count them
+    oldest_ids = (
         select(Draft.id)
         .where(Draft.user_id == user_id)
         .order_by(Draft.updated_at.desc())
+        .offset(MAX_DRAFTS_PER_USER - 1)
+    )
+    await db.execute(
+        delete(Draft).where(Draft.id.in_(oldest_ids))
     )
-    existing_drafts = count_result.scalars().all()
-    
-    if len(existing_drafts) >= MAX_DRAFTS_PER_USER:
-        oldest_ids = existing_drafts[MAX_DRAFTS_PER_USER - 1:]
-        await db.execute(
-            delete(Draft).where(Draft.id.in_(oldest_ids))
-        )
     
     draft = Draft(
         user_id=user_id,
@@ -1,15 +1,22 @@
 import json
 import logging
+import math
+import random
+import time
 from datetime import date, datetime
+from functools import lru_cache
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy import select, desc, and_
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from pydantic import BaseModel, TypeAdapter
+from redis.exceptions import RedisError
+from sqlalchemy import select, desc, and_, exists, func, update, tuple_, lambda_stmt
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, joinedload, raiseload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.db.database import get_db
-from app.models.user import User
+from app.models.user import User, Follow
 from app.models.post import (
     Post, Comment, PostStatus, PostType, ContentFormat, PostLike, CommentLike, InteractionStatus,
 )
@@ -29,11 +36,17 @@ from app.services.rate_limit_service import (
     check_post_rate_limit, check_comment_rate_limit,
 )
 from app.services.redis_service import get_redis
+from app.services.interaction_log_service import interaction_log_writer
+from app.services.post_list_cache import (
+    get_cached_post_list, cache_post_list, invalidate_post_lists, invalidate_all_post_lists,
+)
 from app.config import settings
 from app.services.ai_service import ai_service, AIServiceError
 from app.models.reward import InteractionLog, InteractionType
 
 QUOTE_TTL_SECONDS = 20
+# Likers lists are keyed by post state, so this only bounds staleness of liker names
+LIKERS_CACHE_TTL_SECONDS = 300
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -46,6 +59,9 @@ async def _log_interaction(
     """Record an interaction between two users (for N_novelty)."""
     if actor_id == target_user_id:
         return
+    if interaction_log_writer.log(actor_id, target_user_id, itype.value, ref_id):
+        return
+    # Flusher not running (e.g. tests without lifespan): write with the request
     db.add(InteractionLog(
         actor_id=actor_id,
         target_user_id=target_user_id,
@@ -54,30 +70,40 @@ async def _log_interaction(
     ))
 
 
-def _user_brief(user: User) -> UserBrief:
-    return UserBrief(
-        id=user.id,
-        name=user.name,
-        handle=user.handle,
-        avatar=user.avatar,
-        trust_score=user.trust_score,
-        available_balance=user.available_balance,
-        free_posts_remaining=user.free_posts_remaining,
-    )
+# ── Post list responses ──────────────────────────────────────────────────────
+# Pages are cached per viewer in Redis; see app.services.post_list_cache.
+
+# List endpoints serialize with these adapters and return the bytes directly,
+# skipping FastAPI's jsonable_encoder walk over every row. response_model stays
+# on the decorators for the OpenAPI schema.
+_post_list_adapter = TypeAdapter(list[PostResponse])
+_comment_list_adapter = TypeAdapter(list[CommentResponse])
+
+
+def _json_response(body: bytes | str) -> Response:
+    return Response(content=body, media_type='application/json')
+
 
+# Response builders below use model_construct: the data comes straight from the
+# DB, so re-running field validation per row is wasted work on list endpoints.
+# Ingress schemas (PostCreate, CommentCreate, ...) are still fully validated.
 
 def build_post_response(
     post: Post,
     like_info: dict | None = None,
 ) -> PostResponse:
-    """Build PostResponse from Post model with optional like info."""
+    """Build PostResponse from Post model with optional like info.
+
+    Only post.author is traversed; read queries load it with joinedload and
+    raiseload('*') so any other relationship access fails loudly instead of lazy-loading.
+    """
     is_liked = like_info is not None
     like_status = like_info.get('status') if like_info else None
     locked_until = like_info.get('locked_until') if like_info else None
     
-    return PostResponse(
+    return PostResponse.model_construct(
         id=post.id,
-        author=_user_brief(post.author),
+        author=UserBrief.from_orm_trusted(post.author),
         title=post.title,
         content=post.content,
         content_format=post.content_format or 'plain',
@@ -104,10 +130,10 @@ def _comment_response(c: Comment, author: User, like_info: dict | None = None) -
     like_status = like_info.get('status') if like_info else None
     like_locked_until = like_info.get('locked_until') if like_info else None
     
-    return CommentResponse(
+    return CommentResponse.model_construct(
         id=c.id,
         post_id=c.post_id,
-        author=_user_brief(author),
+        author=UserBrief.from_orm_trusted(author),
         content=c.content,
         parent_id=c.parent_id,
         likes_count=c.likes_count,
@@ -121,53 +147,39 @@ def _comment_response(c: Comment, author: User, like_info: dict | None = None) -
     )
 
 
-async def _check_post_liked(db: AsyncSession, post_ids: list[int], user_id: int) -> dict[int, dict]:
-    """Return dict mapping post_id to like info {status, locked_until}.
-    
-    Only returns non-cancelled likes. Settlement is handled by background cron job.
+def _join_viewer_like(query, like_model, target_col, target_id_col, user_id: int):
+    """Attach the viewer's non-cancelled like (status, locked_until) via LEFT JOIN.
+
+    Rows come back as (entity, like_status, like_locked_until); at most one like
+    per (target, user) thanks to the unique constraint, so no row duplication.
+    Pure SQL construction, so it can be called inside lambda_stmt.
     """
-    if not post_ids or not user_id:
-        return {}
-    
-    result = await db.execute(
-        select(PostLike)
-        .where(PostLike.user_id == user_id)
-        .where(PostLike.post_id.in_(post_ids))
-        .where(PostLike.status != InteractionStatus.CANCELLED.value)
+    return query.add_columns(like_model.status, like_model.locked_until).outerjoin(
+        like_model,
+        and_(
+            target_col == target_id_col,
+            like_model.user_id == user_id,
+            like_model.status != InteractionStatus.CANCELLED.value,
+        ),
     )
-    likes = list(result.scalars().all())
-    
-    return {
-        like.post_id: {
-            'status': like.status,
-            'locked_until': like.locked_until.isoformat() if like.locked_until else None,
-        }
-        for like in likes
-    }
 
 
-async def _check_comment_liked(db: AsyncSession, comment_ids: list[int], user_id: int) -> dict[int, dict]:
-    """Return dict mapping comment_id to like info {status, locked_until}.
-    
-    Only returns non-cancelled likes.
-    """
-    if not comment_ids or not user_id:
-        return {}
-    
-    result = await db.execute(
-        select(CommentLike)
-        .where(CommentLike.user_id == user_id)
-        .where(CommentLike.comment_id.in_(comment_ids))
-        .where(CommentLike.status != InteractionStatus.CANCELLED.value)
-    )
-    likes = list(result.scalars().all())
-    
+def _parse_cursor(cursor: str) -> tuple[datetime, int]:
+    """Parse a keyset cursor: the last item's '{created_at}_{id}'."""
+    ts, _, item_id = cursor.rpartition('_')
+    try:
+        return datetime.fromisoformat(ts), int(item_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail='Invalid cursor') from None
+
+
+def _like_info(status: str | None, locked_until: datetime | None) -> dict | None:
+    """Like info dict {status, locked_until} from joined columns, or None if not liked."""
+    if status is None:
+        return None
     return {
-        like.comment_id: {
-            'status': like.status,
-            'locked_until': like.locked_until.isoformat() if like.locked_until else None,
-        }
-        for like in likes
+        'status': status,
+        'locked_until': locked_until.isoformat() if locked_until else None,
     }
 
 
@@ -211,15 +223,6 @@ async def create_post(
             )
         author.available_balance -= POST_COST
         cost_paid = POST_COST
-        db.add(Ledger(
-            user_id=author_id,
-            amount=-POST_COST,
-            balance_after=author.available_balance,
-            action_type=ActionType.SPEND_POST.value,
-            ref_type=RefType.NONE.value,
-            ref_id=None,
-            note='post creation fee',
-        ))
 
     # Articles require a title
     is_article = post_data.post_type == PostType.ARTICLE.value
@@ -241,7 +244,21 @@ async def create_post(
     )
     db.add(post)
     await db.flush()
-    await db.refresh(post, ['author'])
+    # INSERT already returned id and created_at is a client-side default; no refresh needed
+    set_committed_value(post, 'author', author)
+
+    # Fee entry is added after the post's INSERT so it carries the real post id;
+    # it goes out with the next flush, no follow-up UPDATE needed.
+    if cost_paid:
+        db.add(Ledger(
+            user_id=author_id,
+            amount=-POST_COST,
+            balance_after=author.available_balance,
+            action_type=ActionType.SPEND_POST.value,
+            ref_type=RefType.POST.value,
+            ref_id=post.id,
+            note='post creation fee',
+        ))
 
     # Run AI screening inline so violations are caught before returning
     if settings.ai_enabled and ai_service.api_key:
@@ -270,12 +287,11 @@ async def create_post(
         except Exception:
             logger.exception('AI screening error for post %d, allowing', post.id)
 
+    await db.commit()
+    await invalidate_post_lists(author_id)
     return build_post_response(post)
 
 
-from pydantic import BaseModel
-
-
 class CostEstimateResponse(BaseModel):
     """Response with cost breakdown."""
     post_cost: int
@@ -320,52 +336,76 @@ async def get_posts(
     user_id: int | None = Query(None, description='Current user for is_liked'),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="Last seen post's '{created_at}_{id}'"),
     db: AsyncSession = Depends(get_db),
 ):
-    """Get posts with optional filters."""
-    query = (
+    """Get posts with optional filters.
+
+    Pass `cursor` instead of a growing `offset` to page deep without scanning skipped rows.
+    """
+    cache_field = f'posts:{post_type or ""}:{author_id or ""}:{cursor or ""}:{offset}:{limit}'
+    cached, cache_version = await get_cached_post_list(user_id, cache_field)
+    if cached is not None:
+        return _json_response(cached)
+
+    viewer_id = user_id or 0
+    stmt = lambda_stmt(lambda: _join_viewer_like(
         select(Post)
-        .options(selectinload(Post.author))
+        .options(joinedload(Post.author, innerjoin=True), raiseload('*'))
         .where(Post.status == PostStatus.ACTIVE.value)
-        .order_by(desc(Post.created_at))
-    )
+        .order_by(desc(Post.created_at), desc(Post.id)),
+        PostLike, PostLike.post_id, Post.id, viewer_id,
+    ))
 
+    if cursor:
+        cursor_ts, cursor_id = _parse_cursor(cursor)
+        stmt += lambda s: s.where(tuple_(Post.created_at, Post.id) < tuple_(cursor_ts, cursor_id))
     if post_type:
-        query = query.where(Post.post_type == post_type)
+        stmt += lambda s: s.where(Post.post_type == post_type)
     if author_id:
-        query = query.where(Post.author_id == author_id)
+        stmt += lambda s: s.where(Post.author_id == author_id)
 
-    query = query.limit(limit).offset(offset)
-    result = await db.execute(query)
-    posts = list(result.scalars().all())
+    stmt += lambda s: s.limit(limit).offset(offset)
+    result = await db.execute(stmt)
 
-    like_info_map = await _check_post_liked(db, [p.id for p in posts], user_id or 0)
-    return [build_post_response(p, like_info=like_info_map.get(p.id)) for p in posts]
+    responses = [
+        build_post_response(p, like_info=_like_info(like_status, like_locked_until))
+        for p, like_status, like_locked_until in result.all()
+    ]
+    body = _post_list_adapter.dump_json(responses)
+    await cache_post_list(user_id, cache_field, body, cache_version)
+    return _json_response(body)
 
 
 # AI quality is a trash filter, not a ranking booster — engagement is the real signal
 AI_QUALITY_MULT = {'low': 0.3, 'medium': 1.0, 'good': 1.0, 'great': 1.0}
 
+# created_at is naive UTC; subtracting this gives epoch seconds without the
+# local-time mktime() that naive datetime.timestamp() goes through
+_UTC_EPOCH = datetime(1970, 1, 1)
+
+
+@lru_cache(maxsize=4096)
+def _decay_rate(likes: int) -> float:
+    """ln2 / half-life in days; half-life grows from 3 to 7 days with log(likes)."""
+    half_life = 3.0 + min(4.0, math.log(likes + 1))
+    return math.log(2) / half_life
+
 
 def _feed_score(
     post: Post,
     following_ids: set[int],
-    user_interests: dict[str, int] | None = None,
+    user_interests: dict[str, int] | None,
+    now: float,
 ) -> float:
     """Composite feed score: time_decay * engagement * following * interest * ai_filter + noise."""
-    import math
-    import random
-    import time
-
-    now = time.time()
-    age_days = max(0.01, (now - post.created_at.timestamp()) / 86400)
+    age_days = max(0.01, (now - (post.created_at - _UTC_EPOCH).total_seconds()) / 86400)
 
     likes = post.likes_count or 0
     comments = post.comments_count or 0
 
-    # 1. Time decay
-    half_life = 3.0 + min(4.0, math.log(likes + 1))
-    time_decay = math.exp(-age_days * math.log(2) / half_life)
+    # 1. Time decay (rate depends only on likes, so it's memoized per like count)
+    time_decay = math.exp(-age_days * _decay_rate(likes))
 
     # 2. Engagement signal (likes + comments = the real quality measure)
     like_density = likes / max(1.0, age_days)
@@ -400,35 +440,50 @@ async def get_feed(
     db: AsyncSession = Depends(get_db),
 ):
     """Mixed feed: following posts + global posts, ranked by composite score."""
-    from app.models.user import Follow
-
-    user = await db.get(User, user_id)
-    user_interests = user.interest_tags if user else None
-
-    following_result = await db.execute(
-        select(Follow.following_id).where(Follow.follower_id == user_id)
-    )
-    following_ids = set(row[0] for row in following_result.all())
+    # Also keeps the noisy ranking stable while the user pages through it
+    cache_field = f'feed:{offset}:{limit}'
+    cached, cache_version = await get_cached_post_list(user_id, cache_field)
+    if cached is not None:
+        return _json_response(cached)
+
+    # Viewer's interests and followed ids in one round trip
+    viewer = (await db.execute(
+        select(
+            User.interest_tags,
+            select(func.array_agg(Follow.following_id))
+            .where(Follow.follower_id == user_id)
+            .scalar_subquery(),
+        ).where(User.id == user_id)
+    )).first()
+    user_interests, followed = viewer if viewer else (None, None)
+    following_ids = set(followed or ())
 
     pool_size = max(limit * 5, 150)
-    query = (
+    result = await db.execute(lambda_stmt(lambda: _join_viewer_like(
         select(Post)
-        .options(selectinload(Post.author))
+        .options(joinedload(Post.author, innerjoin=True), raiseload('*'))
         .where(Post.status == PostStatus.ACTIVE.value)
         .order_by(desc(Post.created_at))
-        .limit(pool_size)
-    )
-    result = await db.execute(query)
-    posts = list(result.scalars().all())
+        .limit(pool_size),
+        PostLike, PostLike.post_id, Post.id, user_id,
+    )))
+    rows = list(result.all())
 
-    posts.sort(
-        key=lambda p: _feed_score(p, following_ids, user_interests),
+    # One clock read per request, not per candidate
+    now = time.time()
+    rows.sort(
+        key=lambda row: _feed_score(row[0], following_ids, user_interests, now),
         reverse=True,
     )
-    page = posts[offset:offset + limit]
+    page = rows[offset:offset + limit]
 
-    like_info_map = await _check_post_liked(db, [p.id for p in page], user_id)
-    return [build_post_response(p, like_info=like_info_map.get(p.id)) for p in page]
+    responses = [
+        build_post_response(p, like_info=_like_info(like_status, like_locked_until))
+        for p, like_status, like_locked_until in page
+    ]
+    body = _post_list_adapter.dump_json(responses)
+    await cache_post_list(user_id, cache_field, body, cache_version)
+    return _json_response(body)
 
 
 @router.get('/{post_id}', response_model=PostResponse)
@@ -438,15 +493,19 @@ async def get_post(
     db: AsyncSession = Depends(get_db),
 ):
     """Get a single post by ID."""
-    result = await db.execute(
-        select(Post).options(selectinload(Post.author)).where(Post.id == post_id)
-    )
-    post = result.scalar_one_or_none()
-    if not post:
+    viewer_id = user_id or 0
+    result = await db.execute(lambda_stmt(lambda: _join_viewer_like(
+        select(Post)
+        .options(joinedload(Post.author, innerjoin=True), raiseload('*'))
+        .where(Post.id == post_id),
+        PostLike, PostLike.post_id, Post.id, viewer_id,
+    )))
+    row = result.one_or_none()
+    if not row:
         raise HTTPException(status_code=404, detail='Post not found')
 
-    like_info_map = await _check_post_liked(db, [post.id], user_id or 0)
-    return build_post_response(post, like_info=like_info_map.get(post.id))
+    post, like_status, like_locked_until = row
+    return build_post_response(post, like_info=_like_info(like_status, like_locked_until))
 
 
 @router.patch('/{post_id}', response_model=PostResponse)
@@ -458,7 +517,7 @@ async def update_post(
 ):
     """Update a post (only by author)."""
     result = await db.execute(
-        select(Post).options(selectinload(Post.author)).where(Post.id == post_id)
+        select(Post).options(joinedload(Post.author, innerjoin=True)).where(Post.id == post_id)
     )
     post = result.scalar_one_or_none()
     if not post:
@@ -470,8 +529,9 @@ async def update_post(
     for field, value in update_data.items():
         setattr(post, field, value)
 
-    await db.flush()
-    await db.refresh(post)
+    await db.commit()
+    # The edited post sits on other viewers' cached pages too, not just the author's
+    await invalidate_all_post_lists()
     return build_post_response(post)
 
 
@@ -494,6 +554,8 @@ async def delete_post(
     try:
         refund_summary = await service.delete_post_with_refunds(post_id, author_id)
         await db.commit()
+        # Every viewer's cached pages may hold the post, not just the author's
+        await invalidate_all_post_lists()
         return {'status': 'deleted', **refund_summary}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -540,13 +602,13 @@ async def create_like_quote(
         raise HTTPException(status_code=404, detail='User not found')
     
     # Check if user already liked
-    existing = await db.execute(
-        select(PostLike).where(
+    already_liked = await db.scalar(
+        select(exists().where(
             PostLike.post_id == post_id,
             PostLike.user_id == user_id,
-        )
+        ))
     )
-    if existing.scalar_one_or_none():
+    if already_liked:
         raise HTTPException(status_code=400, detail='Already liked this post')
 
     if post.author_id == user_id:
@@ -631,9 +693,10 @@ async def like_post(
                 user.interest_tags = interests
 
         await db.commit()
+        await invalidate_post_lists(user_id)
 
         return {
-            'likes_count': post.likes_count if post else 0,
+            'likes_count': result['likes_count'],
             'is_liked': True,
             'like_status': result['status'],
             'cost': result['cost'],
@@ -663,13 +726,37 @@ async def get_post_likers(
     db: AsyncSession = Depends(get_db),
 ):
     """Get list of early supporters for a post."""
+    # The list only changes when a like lands (likes_count grows) or a pool
+    # distribution pays earnings (revenue_pool shrinks), so together they version it
+    version = (await db.execute(
+        select(Post.likes_count, Post.revenue_pool).where(Post.id == post_id)
+    )).one_or_none()
+    cache_key = f'likers:{post_id}:{version[0]}:{version[1]}' if version else None
+    if cache_key:
+        try:
+            redis = await get_redis()
+            cached = await redis.get(cache_key)
+        except RedisError:
+            logger.warning('Likers cache read failed', exc_info=True)
+            cached = None
+        if cached is not None:
+            return _json_response(cached)
+
     service = DynamicLikeService(db)
     try:
         likers = await service.get_post_likers(post_id)
-        return {'likers': likers}
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
+    body = json.dumps({'likers': likers})
+    if cache_key:
+        try:
+            redis = await get_redis()
+            await redis.set(cache_key, body, ex=LIKERS_CACHE_TTL_SECONDS)
+        except RedisError:
+            logger.warning('Likers cache write failed', exc_info=True)
+    return _json_response(body)
+
 
 # ── Comments ─────────────────────────────────────────────────────────────────
 
@@ -691,11 +778,27 @@ async def create_comment(
     
     Rate limited: 3/minute, 20/hour.
     """
-    post = await db.get(Post, post_id)
-    if not post or post.status != PostStatus.ACTIVE.value:
+    # Post, commenter and (for replies) the parent chain in one round-trip
+    query = (
+        select(Post, User)
+        .select_from(Post)
+        .outerjoin(User, User.id == author_id)
+        .where(Post.id == post_id)
+    )
+    if comment_data.parent_id:
+        parent = aliased(Comment)
+        top_parent = aliased(Comment)
+        query = (
+            query.add_columns(parent, top_parent)
+            .outerjoin(parent, parent.id == comment_data.parent_id)
+            .outerjoin(top_parent, top_parent.id == parent.parent_id)
+        )
+    row = (await db.execute(query)).one_or_none()
+
+    if not row or row[0].status != PostStatus.ACTIVE.value:
         raise HTTPException(status_code=404, detail='Post not found')
+    post, author = row[0], row[1]
 
-    author = await db.get(User, author_id)
     if not author:
         raise HTTPException(status_code=404, detail='Author not found')
 
@@ -708,14 +811,14 @@ async def create_comment(
     actual_parent_id = comment_data.parent_id
     parent_comment = None
     if comment_data.parent_id:
-        parent_comment = await db.get(Comment, comment_data.parent_id)
+        parent_comment, top_parent_comment = row[2], row[3]
         if not parent_comment or parent_comment.post_id != post_id:
             raise HTTPException(status_code=400, detail='Invalid parent comment')
         # If replying to a reply, flatten to same level (use the top-level comment as parent)
         if parent_comment.parent_id:
             actual_parent_id = parent_comment.parent_id
-            # Get the actual parent for payment
-            parent_comment = await db.get(Comment, actual_parent_id)
+            # The actual parent gets the payment
+            parent_comment = top_parent_comment
 
     # Determine cost and recipient
     if actual_parent_id and parent_comment:
@@ -778,16 +881,19 @@ async def create_comment(
         recipient_id=recipient_id,
     )
     db.add(comment)
-    post.comments_count += 1
+    await db.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(comments_count=Post.comments_count + 1)
+    )
+
+    await db.commit()
 
-    # Log interaction
+    # Log interaction once the comment is committed, so a rolled-back one isn't counted
     is_reply = comment_data.parent_id is not None
     itype = InteractionType.REPLY if is_reply else InteractionType.COMMENT
     await _log_interaction(db, author_id, post.author_id, itype, post_id)
 
-    await db.flush()
-    await db.refresh(comment)
-
     return _comment_response(comment, author)
 
 
@@ -797,32 +903,36 @@ async def get_comments(
     user_id: int | None = Query(None, description='Current user for is_liked'),
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="Last seen comment's '{created_at}_{id}'"),
     db: AsyncSession = Depends(get_db),
 ):
     """Get comments for a post. Excludes cancelled/deleted comments."""
-    result = await db.execute(
+    viewer_id = user_id or 0
+    stmt = lambda_stmt(lambda: _join_viewer_like(
         select(Comment)
-        .options(selectinload(Comment.author))
+        .options(joinedload(Comment.author, innerjoin=True), raiseload('*'))
         .where(
             and_(
                 Comment.post_id == post_id,
                 Comment.interaction_status != InteractionStatus.CANCELLED.value,
             )
         )
-        .order_by(Comment.created_at)
+        .order_by(Comment.created_at, Comment.id)
         .limit(limit)
-        .offset(offset)
-    )
-    comments = list(result.scalars().all())
-
-    like_info_map = await _check_comment_liked(
-        db, [c.id for c in comments], user_id or 0,
-    )
+        .offset(offset),
+        CommentLike, CommentLike.comment_id, Comment.id, viewer_id,
+    ))
+    if cursor:
+        cursor_ts, cursor_id = _parse_cursor(cursor)
+        stmt += lambda s: s.where(
+            tuple_(Comment.created_at, Comment.id) > tuple_(cursor_ts, cursor_id)
+        )
+    result = await db.execute(stmt)
 
-    return [
-        _comment_response(c, c.author, like_info=like_info_map.get(c.id))
-        for c in comments
-    ]
+    return _json_response(_comment_list_adapter.dump_json([
+        _comment_response(c, c.author, like_info=_like_info(like_status, like_locked_until))
+        for c, like_status, like_locked_until in result.all()
+    ]))
 
 
 @router.delete('/comments/{comment_id}', status_code=status.HTTP_200_OK)
@@ -843,9 +953,11 @@ async def delete_comment(
         raise HTTPException(status_code=400, detail='Comment already deleted')
 
     # Update post comment count
-    post = await db.get(Post, comment.post_id)
-    if post:
-        post.comments_count = max(0, post.comments_count - 1)
+    await db.execute(
+        update(Post)
+        .where(Post.id == comment.post_id)
+        .values(comments_count=func.greatest(Post.comments_count - 1, 0))
+    )
 
     # Soft delete
     comment.interaction_status = InteractionStatus.CANCELLED.value
@@ -864,7 +976,6 @@ async def get_comment_like_cost(
     db: AsyncSession = Depends(get_db),
 ):
     """Get current dynamic like cost for a comment."""
-    from app.services.dynamic_like_service import comment_like_cost
     
     comment = await db.get(Comment, comment_id)
     if not comment or comment.post_id != post_id:
@@ -897,13 +1008,13 @@ async def create_comment_like_quote(
         raise HTTPException(status_code=404, detail='User not found')
     
     # Check if user already liked
-    existing = await db.execute(
-        select(CommentLike).where(
+    already_liked = await db.scalar(
+        select(exists().where(
             CommentLike.comment_id == comment_id,
             CommentLike.user_id == user_id,
-        )
+        ))
     )
-    if existing.scalar_one_or_none():
+    if already_liked:
         raise HTTPException(status_code=400, detail='Already liked this comment')
 
     if comment.author_id == user_id:
@@ -992,7 +1103,7 @@ async def like_comment(
         )
 
         return {
-            'likes_count': comment.likes_count,
+            'likes_count': result['likes_count'],
             'is_liked': True,
             'like_status': result['status'],
             'cost': result['cost'],
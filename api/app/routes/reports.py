@@ -1,15 +1,17 @@
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, exists, func, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 
 from app.db.database import get_db
 from app.models.user import User
 from app.models.post import Post, PostStatus
 from app.models.report import Report, ReportStatus
 from app.schemas.ai import ReportCreate, ReportResponse
-from app.services.ai_service import ai_service, AIServiceError
+from app.services.ai_service import ai_service, AIServiceError, MAX_PROMPT_CONTENT_CHARS
+from app.services.post_list_cache import invalidate_all_post_lists
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -24,24 +26,36 @@ async def create_report(
     db: AsyncSession = Depends(get_db),
 ):
     """Report a post. AI judges the report and may auto-hide the post."""
-    reporter = await db.get(User, reporter_id)
-    if not reporter:
+    # Post (content truncated to what the judge sees), reporter existence and the
+    # duplicate check in one round trip
+    result = await db.execute(
+        select(
+            Post,
+            func.substr(Post.content, 1, MAX_PROMPT_CONTENT_CHARS),
+            exists().where(User.id == reporter_id),
+            exists().where(Report.post_id == Post.id, Report.reporter_id == reporter_id),
+        )
+        .options(defer(Post.content))
+        .where(Post.id == data.post_id)
+    )
+    row = result.first()
+    if row is None:
+        # Unknown reporter still wins over unknown post
+        if not await db.scalar(select(exists().where(User.id == reporter_id))):
+            raise HTTPException(status_code=404, detail='User not found')
+        raise HTTPException(status_code=404, detail='Post not found')
+    post, content_preview, reporter_exists, already_reported = row
+
+    if not reporter_exists:
         raise HTTPException(status_code=404, detail='User not found')
 
-    post = await db.get(Post, data.post_id)
-    if not post or post.status == PostStatus.DELETED.value:
+    if post.status == PostStatus.DELETED.value:
         raise HTTPException(status_code=404, detail='Post not found')
 
     if post.author_id == reporter_id:
         raise HTTPException(status_code=400, detail='Cannot report your own post')
 
-    existing = await db.execute(
-        select(Report).where(
-            Report.post_id == data.post_id,
-            Report.reporter_id == reporter_id,
-        )
-    )
-    if existing.scalar_one_or_none():
+    if already_reported:
         raise HTTPException(status_code=409, detail='You already reported this post')
 
     report = Report(
@@ -52,7 +66,7 @@ async def create_report(
 
     try:
         verdict = await ai_service.judge_report(
-            post.content, data.reason, db=db, ref_id=data.post_id,
+            content_preview, data.reason, db=db, ref_id=data.post_id,
         )
         report.verdict = verdict.verdict
         report.confidence = verdict.confidence
@@ -62,9 +76,11 @@ async def create_report(
         if verdict.verdict == 'valid' and verdict.confidence >= 0.7:
             post.status = PostStatus.CHALLENGED.value
             action = 'post_hidden'
-            author = await db.get(User, post.author_id)
-            if author:
-                author.risk_score = min(1000, author.risk_score + RISK_SCORE_PENALTY)
+            await db.execute(
+                update(User)
+                .where(User.id == post.author_id)
+                .values(risk_score=func.least(1000, User.risk_score + RISK_SCORE_PENALTY))
+            )
         elif verdict.verdict == 'escalate':
             action = 'escalated_for_review'
 
@@ -77,7 +93,10 @@ async def create_report(
         report.action_taken = 'escalated_for_review'
 
     db.add(report)
-    await db.flush()
+    await db.commit()
+    if report.action_taken == 'post_hidden':
+        # Hidden posts must drop out of every viewer's cached pages
+        await invalidate_all_post_lists()
 
     return ReportResponse(
         id=report.id,
@@ -101,7 +120,11 @@ async def get_reports(
     db: AsyncSession = Depends(get_db),
 ):
     """List reports with optional filters (admin endpoint)."""
-    query = select(Report).order_by(desc(Report.created_at))
+    # Plain column rows: nothing here is modified, so skip ORM instances and the identity map
+    query = select(
+        Report.id, Report.post_id, Report.reporter_id, Report.reason, Report.verdict,
+        Report.confidence, Report.ai_reason, Report.action_taken, Report.created_at,
+    ).order_by(desc(Report.created_at))
 
     if post_id is not None:
         query = query.where(Report.post_id == post_id)
@@ -110,10 +133,9 @@ async def get_reports(
 
     query = query.limit(limit).offset(offset)
     result = await db.execute(query)
-    reports = list(result.scalars().all())
 
     return [
-        ReportResponse(
+        ReportResponse.model_construct(
             id=r.id,
             post_id=r.post_id,
             reporter_id=r.reporter_id,
@@ -124,5 +146,5 @@ async def get_reports(
             action_taken=r.action_taken,
             created_at=r.created_at.isoformat(),
         )
-        for r in reports
+        for r in result
     ]
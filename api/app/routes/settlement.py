@@ -4,13 +4,26 @@ Settlement API - Distributes accumulated liker earnings pools.
 Called by cron every 60 seconds. For each post/comment with revenue_pool > 0,
 divides the pool equally among settled likers and credits their balances.
 """
+import json
+import logging
+
 from fastapi import APIRouter, Depends, Query
+from redis.exceptions import RedisError
+from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.database import get_db
+from app.models.post import Post, Comment
 from app.services.dynamic_like_service import DynamicLikeService
+from app.services.redis_service import get_redis
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Pool stats scan every post/comment with a pool; monitoring can read them slightly stale.
+# Each settlement run drops the entry, so the numbers never lag a distribution.
+POOL_STATS_CACHE_KEY = 'settlement:pool_stats'
+POOL_STATS_CACHE_TTL_SECONDS = 30
 
 
 @router.post('/settle-likes')
@@ -26,6 +39,11 @@ async def distribute_liker_earnings(
     service = DynamicLikeService(db)
     result = await service.distribute_pools(batch_size)
     await db.commit()
+    try:
+        redis = await get_redis()
+        await redis.delete(POOL_STATS_CACHE_KEY)
+    except RedisError:
+        logger.warning('Pool stats cache invalidation failed', exc_info=True)
     return result
 
 
@@ -34,29 +52,41 @@ async def get_pool_stats(
     db: AsyncSession = Depends(get_db),
 ):
     """Get stats on undistributed revenue pools (for monitoring)."""
-    from sqlalchemy import select, func
-    from app.models.post import Post, Comment
-
-    post_result = await db.execute(
-        select(
-            func.count(Post.id),
-            func.coalesce(func.sum(Post.revenue_pool), 0)
-        ).where(Post.revenue_pool > 0)
-    )
-    post_row = post_result.one()
-
-    comment_result = await db.execute(
-        select(
-            func.count(Comment.id),
-            func.coalesce(func.sum(Comment.revenue_pool), 0)
-        ).where(Comment.revenue_pool > 0)
-    )
-    comment_row = comment_result.one()
-
-    return {
-        'posts_with_pool': post_row[0],
-        'post_pool_total': post_row[1],
-        'comments_with_pool': comment_row[0],
-        'comment_pool_total': comment_row[1],
-        'total_undistributed': post_row[1] + comment_row[1],
+    try:
+        redis = await get_redis()
+        cached = await redis.get(POOL_STATS_CACHE_KEY)
+    except RedisError:
+        logger.warning('Pool stats cache read failed', exc_info=True)
+        cached = None
+    if cached is not None:
+        return json.loads(cached)
+
+    # Both aggregates are single-row subqueries; cross-joining them returns
+    # all four numbers in one round trip
+    posts = select(
+        func.count(Post.id).label('count'),
+        func.coalesce(func.sum(Post.revenue_pool), 0).label('total'),
+    ).where(Post.revenue_pool > 0).subquery()
+    comments = select(
+        func.count(Comment.id).label('count'),
+        func.coalesce(func.sum(Comment.revenue_pool), 0).label('total'),
+    ).where(Comment.revenue_pool > 0).subquery()
+    post_count, post_total, comment_count, comment_total = (
+        await db.execute(select(posts.c.count, posts.c.total, comments.c.count, comments.c.total))
+    ).one()
+    # SUM(bigint) comes back as numeric (Decimal), which json.dumps can't cache
+    post_total, comment_total = int(post_total), int(comment_total)
+
+    stats = {
+        'posts_with_pool': post_count,
+        'post_pool_total': post_total,
+        'comments_with_pool': comment_count,
+        'comment_pool_total': comment_total,
+        'total_undistributed': post_total + comment_total,
     }
+    try:
+        redis = await get_redis()
+        await redis.set(POOL_STATS_CACHE_KEY, json.dumps(stats), ex=POOL_STATS_CACHE_TTL_SECONDS)
+    except RedisError:
+        logger.warning('Pool stats cache write failed', exc_info=True)
+    return stats
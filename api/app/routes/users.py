@@ -1,6 +1,9 @@
 from datetime import datetime, timedelta, date
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy import select, func, and_
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from pydantic import TypeAdapter
+from sqlalchemy import select, func, and_, or_, delete, exists, bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.database import get_db
@@ -8,10 +11,25 @@ from app.models.user import User, Follow
 from app.models.ledger import Ledger
 from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserBrief
 from app.schemas.ledger import LedgerEntry, BalanceResponse
+from app.services.follow_cache import invalidate_follow
 from app.services.ledger_service import LedgerService
 
 router = APIRouter()
 
+# Column-only selects for UserBrief lists: plain rows skip ORM identity-map work and
+# never drag in User's other columns (email, scores, interest_tags, ...)
+_BRIEF_COLUMNS = (User.id, User.name, User.handle, User.avatar, User.available_balance)
+
+# Brief lists are built with model_construct from those rows (already the right types)
+# and dumped to bytes directly, skipping response_model revalidation and
+# jsonable_encoder. response_model stays on the decorators for the OpenAPI schema.
+_brief_list_adapter = TypeAdapter(list[UserBrief])
+
+
+def _brief_list_response(result) -> Response:
+    briefs = [UserBrief.model_construct(**row) for row in result.mappings()]
+    return Response(content=_brief_list_adapter.dump_json(briefs), media_type='application/json')
+
 
 @router.get('', response_model=list[UserBrief])
 async def list_users(
@@ -19,8 +37,8 @@ async def list_users(
     db: AsyncSession = Depends(get_db),
 ):
     """List all users (for dev user selection)."""
-    result = await db.execute(select(User).limit(limit))
-    return result.scalars().all()
+    result = await db.execute(select(*_BRIEF_COLUMNS).limit(limit))
+    return _brief_list_response(result)
 
 
 @router.get('/search', response_model=list[UserBrief])
@@ -33,21 +51,20 @@ async def search_users(
     # Strip @ if provided
     query = q.lstrip('@').lower()
     
-    # Search by handle prefix (case-insensitive)
+    # Search by handle prefix (case-insensitive); served by ix_users_handle_lower
     result = await db.execute(
-        select(User)
+        select(*_BRIEF_COLUMNS)
         .where(func.lower(User.handle).like(f'{query}%'))
         .order_by(User.handle)
         .limit(limit)
     )
-    return result.scalars().all()
+    return _brief_list_response(result)
 
 
 @router.post('', response_model=UserBrief, status_code=status.HTTP_201_CREATED)
 async def create_user(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """Create a new user (0 sat, 1 free post)."""
-    existing = await db.execute(select(User).where(User.handle == user_data.handle))
-    if existing.scalar_one_or_none():
+    if await db.scalar(select(exists().where(User.handle == user_data.handle))):
         raise HTTPException(status_code=400, detail='Handle already taken')
 
     user = User(
@@ -62,34 +79,25 @@ async def create_user(user_data: UserCreate, db: AsyncSession = Depends(get_db))
     return user
 
 
-@router.get('/{user_id}', response_model=UserResponse)
-async def get_user(
-    user_id: int,
-    current_user_id: int | None = Query(None),
-    db: AsyncSession = Depends(get_db),
-):
-    """Get user by ID."""
-    user = await db.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail='User not found')
-
-    # Count followers and following
-    followers_count = await db.scalar(
-        select(func.count()).where(Follow.following_id == user_id)
-    )
-    following_count = await db.scalar(
-        select(func.count()).where(Follow.follower_id == user_id)
-    )
+async def _build_user_response(
+    db: AsyncSession, user: User, current_user_id: int | None,
+) -> UserResponse:
+    """Profile response for an already-loaded user."""
+    user_id = user.id
 
-    # Check if current user is following
-    is_following = False
+    # Followers, following and whether current user follows, in one pass over follows
+    stats = select(
+        func.count().filter(Follow.following_id == user_id),
+        func.count().filter(Follow.follower_id == user_id),
+    ).where(or_(Follow.following_id == user_id, Follow.follower_id == user_id))
     if current_user_id:
-        follow = await db.execute(
-            select(Follow).where(
+        stats = stats.add_columns(
+            func.count().filter(
                 and_(Follow.follower_id == current_user_id, Follow.following_id == user_id)
             )
         )
-        is_following = follow.scalar_one_or_none() is not None
+    followers_count, following_count, *follow_check = (await db.execute(stats)).one()
+    is_following = bool(follow_check and follow_check[0])
 
     return UserResponse(
         id=user.id,
@@ -105,6 +113,20 @@ async def get_user(
     )
 
 
+@router.get('/{user_id}', response_model=UserResponse)
+async def get_user(
+    user_id: int,
+    current_user_id: int | None = Query(None),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get user by ID."""
+    user = await db.get(User, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail='User not found')
+
+    return await _build_user_response(db, user, current_user_id)
+
+
 @router.get('/handle/{handle}', response_model=UserResponse)
 async def get_user_by_handle(
     handle: str,
@@ -117,7 +139,7 @@ async def get_user_by_handle(
     if not user:
         raise HTTPException(status_code=404, detail='User not found')
 
-    return await get_user(user.id, current_user_id, db)
+    return await _build_user_response(db, user, current_user_id)
 
 
 @router.patch('/{user_id}', response_model=UserBrief)
@@ -148,23 +170,22 @@ async def follow_user(
     if user_id == follower_id:
         raise HTTPException(status_code=400, detail='Cannot follow yourself')
 
-    # Check both users exist
-    user = await db.get(User, user_id)
-    follower = await db.get(User, follower_id)
-    if not user or not follower:
-        raise HTTPException(status_code=404, detail='User not found')
-
-    # Check if already following
-    existing = await db.execute(
-        select(Follow).where(
-            and_(Follow.follower_id == follower_id, Follow.following_id == user_id)
-        )
-    )
-    if existing.scalar_one_or_none():
+    # One statement: unique_follow absorbs duplicates, the FKs check both users exist
+    try:
+        follow_id = (await db.execute(
+            pg_insert(Follow)
+            .values(follower_id=follower_id, following_id=user_id)
+            .on_conflict_do_nothing(constraint='unique_follow')
+            .returning(Follow.id)
+        )).scalar_one_or_none()
+    except IntegrityError:
+        raise HTTPException(status_code=404, detail='User not found') from None
+    if follow_id is None:
         raise HTTPException(status_code=400, detail='Already following')
 
-    follow = Follow(follower_id=follower_id, following_id=user_id)
-    db.add(follow)
+    # Commit before invalidating so a concurrent check can't re-cache the old answer
+    await db.commit()
+    await invalidate_follow(follower_id, user_id)
     return {'status': 'followed'}
 
 
@@ -176,15 +197,15 @@ async def unfollow_user(
 ):
     """Unfollow a user."""
     result = await db.execute(
-        select(Follow).where(
-            and_(Follow.follower_id == follower_id, Follow.following_id == user_id)
-        )
+        delete(Follow)
+        .where(and_(Follow.follower_id == follower_id, Follow.following_id == user_id))
+        .returning(Follow.id)
     )
-    follow = result.scalar_one_or_none()
-    if not follow:
+    if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail='Not following this user')
 
-    await db.delete(follow)
+    await db.commit()
+    await invalidate_follow(follower_id, user_id)
     return {'status': 'unfollowed'}
 
 
@@ -197,13 +218,13 @@ async def get_followers(
 ):
     """Get user's followers."""
     result = await db.execute(
-        select(User)
+        select(*_BRIEF_COLUMNS)
         .join(Follow, Follow.follower_id == User.id)
         .where(Follow.following_id == user_id)
         .limit(limit)
         .offset(offset)
     )
-    return result.scalars().all()
+    return _brief_list_response(result)
 
 
 @router.get('/{user_id}/following', response_model=list[UserBrief])
@@ -215,36 +236,40 @@ async def get_following(
 ):
     """Get users that this user follows."""
     result = await db.execute(
-        select(User)
+        select(*_BRIEF_COLUMNS)
         .join(Follow, Follow.following_id == User.id)
         .where(Follow.follower_id == user_id)
         .limit(limit)
         .offset(offset)
     )
-    return result.scalars().all()
+    return _brief_list_response(result)
 
 
 # --- Balance & Ledger ---
 
+# Balance plus the sum of ledger amounts since cutoff, in one round trip. Built once
+# with bind params so each request only binds values.
+_BALANCE_STMT = select(
+    User.available_balance,
+    select(func.coalesce(func.sum(Ledger.amount), 0))
+    .where(and_(Ledger.user_id == User.id, Ledger.created_at >= bindparam('cutoff')))
+    .scalar_subquery()
+    .label('change_24h'),
+).where(User.id == bindparam('user_id'))
+
+
 @router.get('/{user_id}/balance', response_model=BalanceResponse)
 async def get_balance(user_id: int, db: AsyncSession = Depends(get_db)):
     """Get user's sat balance with 24h net change."""
-    user = await db.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail='User not found')
-
-    # Sum all ledger amounts in last 24h
     cutoff = datetime.utcnow() - timedelta(hours=24)
-    result = await db.execute(
-        select(func.coalesce(func.sum(Ledger.amount), 0))
-        .where(and_(Ledger.user_id == user_id, Ledger.created_at >= cutoff))
-    )
-    change_24h = result.scalar_one()
+    row = (await db.execute(_BALANCE_STMT, {'user_id': user_id, 'cutoff': cutoff})).first()
+    if not row:
+        raise HTTPException(status_code=404, detail='User not found')
 
     return BalanceResponse(
-        user_id=user.id,
-        available_balance=user.available_balance,
-        change_24h=change_24h,
+        user_id=user_id,
+        available_balance=row.available_balance,
+        change_24h=row.change_24h,
     )
 
 
@@ -268,6 +293,24 @@ async def get_ledger(
 
 # --- Action Costs ---
 
+# The cost table only varies with whether a free post is left, so both variants
+# are built once instead of per request
+_ACTION_COSTS = {
+    'comment': 5,
+    'reply': 1,
+    'like_post_min': 10,
+    'like_post_formula': '10 * sqrt(1 + likes)',
+    'like_comment_min': 3,
+    'like_comment_formula': '3 * sqrt(1 + likes)',
+}
+_COSTS_WITH_FREE_POST = {'post': 0, **_ACTION_COSTS}
+_COSTS_WITHOUT_FREE_POST = {'post': 10, **_ACTION_COSTS}
+_REVENUE_SPLIT = {
+    'author_pct': 10,
+    'likers_pct': 85,
+    'platform_pct': 5,
+}
+
 @router.get('/{user_id}/costs')
 async def get_user_costs(user_id: int, db: AsyncSession = Depends(get_db)):
     """Get action costs. Ascending price curve for likes.
@@ -289,18 +332,6 @@ async def get_user_costs(user_id: int, db: AsyncSession = Depends(get_db)):
     return {
         'user_id': user.id,
         'free_posts_remaining': free_remaining,
-        'costs': {
-            'post': 0 if free_remaining > 0 else 10,
-            'comment': 5,
-            'reply': 1,
-            'like_post_min': 10,
-            'like_post_formula': '10 * sqrt(1 + likes)',
-            'like_comment_min': 3,
-            'like_comment_formula': '3 * sqrt(1 + likes)',
-        },
-        'revenue_split': {
-            'author_pct': 10,
-            'likers_pct': 85,
-            'platform_pct': 5,
-        },
+        'costs': _COSTS_WITH_FREE_POST if free_remaining > 0 else _COSTS_WITHOUT_FREE_POST,
+        'revenue_split': _REVENUE_SPLIT,
     }
@@ -1,3 +1,10 @@
+import os
+
+# Skip pydantic-core's self-check of every generated CoreSchema. The schemas come
+# from pydantic itself, so the check only costs import time. Set before the
+# schema modules below build anything.
+os.environ.setdefault('PYDANTIC_SKIP_VALIDATING_CORE_SCHEMAS', 'true')
+
 from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserBrief
 from app.schemas.post import PostCreate, PostUpdate, PostResponse, CommentCreate, CommentResponse
 from app.schemas.chat import (
@@ -0,0 +1,15 @@
+"""Constrained string types shared across request schemas.
+
+Each pattern is declared once here and reused, so every field using it shares
+one validator instead of compiling its own copy.
+"""
+from typing import Annotated
+
+from pydantic import Field
+
+Handle = Annotated[str, Field(min_length=1, max_length=50, pattern=r'^[a-zA-Z0-9_]+$')]
+PostTypeName = Annotated[str, Field(pattern=r'^(note|article|question)$')]
+ContentFormat = Annotated[str, Field(pattern=r'^(plain|markdown)$')]
+SendPolicy = Annotated[str, Field(pattern='^(all|admins_only)$')]
+RoleName = Annotated[str, Field(pattern='^(admin|member)$')]
+JoinAction = Annotated[str, Field(pattern='^(approve|reject)$')]
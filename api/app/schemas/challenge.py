@@ -1,12 +1,14 @@
 from datetime import datetime
-from pydantic import BaseModel, Field
+from typing import Literal
+
+from pydantic import BaseModel
 
 
 class ChallengeCreate(BaseModel):
     """Schema for creating a challenge."""
-    content_type: str = Field(..., pattern=r'^(post|comment)$')
+    content_type: Literal['post', 'comment']
     content_id: int
-    reason: str = Field(..., pattern=r'^(spam|scam|inappropriate|misinformation|harassment)$')
+    reason: Literal['spam', 'scam', 'inappropriate', 'misinformation', 'harassment']
 
 
 class ChallengeResponse(BaseModel):
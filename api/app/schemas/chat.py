@@ -1,6 +1,8 @@
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
+from typing_extensions import TypedDict
 
+from app.schemas._types import SendPolicy, RoleName, JoinAction
 from app.schemas.user import UserBrief
 
 
@@ -18,8 +20,8 @@ class ChatSessionUpdate(BaseModel):
     name: str | None = Field(None, max_length=100)
     avatar: str | None = None
     description: str | None = Field(None, max_length=500)
-    who_can_send: str | None = Field(None, pattern='^(all|admins_only)$')
-    who_can_add: str | None = Field(None, pattern='^(all|admins_only)$')
+    who_can_send: SendPolicy | None = None
+    who_can_add: SendPolicy | None = None
     join_approval: bool | None = None
     member_limit: int | None = Field(None, ge=2, le=1000)
 
@@ -31,8 +33,7 @@ class MemberInfo(BaseModel):
     is_muted: bool = False
     joined_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class ChatSessionResponse(BaseModel):
@@ -54,8 +55,7 @@ class ChatSessionResponse(BaseModel):
     created_at: datetime
     user_has_left: bool = False
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class GroupDetailResponse(BaseModel):
@@ -74,8 +74,7 @@ class GroupDetailResponse(BaseModel):
     my_role: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class AddMembersRequest(BaseModel):
@@ -85,7 +84,7 @@ class AddMembersRequest(BaseModel):
 
 class UpdateRoleRequest(BaseModel):
     """Request to update a member's role."""
-    role: str = Field(..., pattern='^(admin|member)$')
+    role: RoleName
 
 
 class MuteRequest(BaseModel):
@@ -115,8 +114,7 @@ class InviteLinkResponse(BaseModel):
     is_active: bool
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class InvitePreviewResponse(BaseModel):
@@ -137,13 +135,12 @@ class JoinRequestResponse(BaseModel):
     status: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class JoinRequestAction(BaseModel):
     """Action on a join request."""
-    action: str = Field(..., pattern='^(approve|reject)$')
+    action: JoinAction
 
 
 class MessageCreate(BaseModel):
@@ -153,7 +150,9 @@ class MessageCreate(BaseModel):
     reply_to_id: int | None = None
 
 
-class ReplyInfo(BaseModel):
+# Output-only leaf records embedded in every message: plain dicts, not models
+
+class ReplyInfo(TypedDict):
     """Brief info about the message being replied to."""
     id: int
     content: str
@@ -161,7 +160,7 @@ class ReplyInfo(BaseModel):
     sender_name: str
 
 
-class ReactionInfo(BaseModel):
+class ReactionInfo(TypedDict):
     """Reaction info with user details."""
     emoji: str
     user_id: int
@@ -178,8 +177,7 @@ class TransferInfo(BaseModel):
     accepted_at: datetime | None = None
     refunded_at: datetime | None = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class MessageResponse(BaseModel):
@@ -197,8 +195,7 @@ class MessageResponse(BaseModel):
     transfer: TransferInfo | None = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class ReactionCreate(BaseModel):
@@ -214,5 +211,4 @@ class ReactionResponse(BaseModel):
     emoji: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
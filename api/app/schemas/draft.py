@@ -1,10 +1,12 @@
 from datetime import datetime
 from pydantic import BaseModel, Field
 
+from app.schemas._types import PostTypeName
+
 
 class DraftCreate(BaseModel):
     """Schema for creating/updating a draft."""
-    post_type: str = Field(default='note', pattern=r'^(note|article|question)$')
+    post_type: PostTypeName = 'note'
     title: str | None = Field(None, max_length=200)
     content: str = Field(default='', max_length=50000)
     bounty: int | None = Field(None, ge=0)
@@ -13,7 +15,7 @@ class DraftCreate(BaseModel):
 
 class DraftUpdate(BaseModel):
     """Schema for updating a draft."""
-    post_type: str | None = Field(None, pattern=r'^(note|article|question)$')
+    post_type: PostTypeName | None = None
     title: str | None = Field(None, max_length=200)
     content: str | None = Field(None, max_length=50000)
     bounty: int | None = None
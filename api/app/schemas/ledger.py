@@ -1,5 +1,5 @@
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class LedgerEntry(BaseModel):
@@ -14,8 +14,7 @@ class LedgerEntry(BaseModel):
     note: str | None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class BalanceResponse(BaseModel):
@@ -23,3 +22,5 @@ class BalanceResponse(BaseModel):
     user_id: int
     available_balance: int
     change_24h: int = 0
+
+    model_config = ConfigDict(defer_build=True)
@@ -1,19 +1,20 @@
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 
+from app.schemas._types import PostTypeName, ContentFormat
 from app.schemas.user import UserBrief
 
 
 class PostBase(BaseModel):
     """Base post fields."""
     content: str = Field(..., min_length=1, max_length=50000)
-    post_type: str = Field(default='note', pattern=r'^(note|article|question)$')
+    post_type: PostTypeName = 'note'
 
 
 class PostCreate(PostBase):
     """Schema for creating a post."""
     title: str | None = Field(None, max_length=200)
-    content_format: str = Field(default='plain', pattern=r'^(plain|markdown)$')
+    content_format: ContentFormat = 'plain'
     bounty: int | None = Field(None, ge=0)
     media_urls: list[str] = Field(default_factory=list, max_length=9)
 
@@ -46,8 +47,7 @@ class PostResponse(BaseModel):
     like_status: str | None = None
     locked_until: str | None = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class CommentBase(BaseModel):
@@ -76,5 +76,4 @@ class CommentResponse(BaseModel):
     interaction_status: str = 'settled'
     locked_until: datetime | None = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
@@ -1,11 +1,13 @@
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
+
+from app.schemas._types import Handle
 
 
 class UserBase(BaseModel):
     """Base user fields."""
     name: str = Field(..., min_length=1, max_length=100)
-    handle: str = Field(..., min_length=1, max_length=50, pattern=r'^[a-zA-Z0-9_]+$')
+    handle: Handle
     bio: str | None = Field(None, max_length=300)
 
 
@@ -29,8 +31,28 @@ class UserBrief(BaseModel):
     avatar: str | None
     available_balance: int = 0
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
+
+    @classmethod
+    def from_orm_trusted(cls, user) -> 'UserBrief':
+        """Build from a loaded User (or row with the same fields) without re-validating DB values."""
+        return cls.model_construct(
+            id=user.id,
+            name=user.name,
+            handle=user.handle,
+            avatar=user.avatar,
+            available_balance=user.available_balance,
+        )
+
+    @classmethod
+    def from_orm_public(cls, user) -> 'UserBrief':
+        """Like from_orm_trusted, but leaves available_balance at 0 for briefs shown to other users."""
+        return cls.model_construct(
+            id=user.id,
+            name=user.name,
+            handle=user.handle,
+            avatar=user.avatar,
+        )
 
 
 class UserResponse(UserBrief):
@@ -41,5 +63,4 @@ class UserResponse(UserBrief):
     following_count: int = 0
     is_following: bool = False
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
@@ -1,19 +1,28 @@
+import hashlib
 import json
 import logging
 from datetime import datetime
 
 import httpx
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.models.ai_usage import AIUsage
 from app.schemas.ai import ReportVerdict, PostEvaluation
+from app.services.redis_service import get_redis
 
 logger = logging.getLogger(__name__)
 
 VALID_QUALITY = ('low', 'medium', 'good', 'great')
 VALID_SEVERITY = ('none', 'low', 'high')
 
+# Content beyond this many characters is not sent to the model
+MAX_PROMPT_CONTENT_CHARS = 3000
+
+# Identical (content, reason) reports get the same verdict without another LLM call
+VERDICT_CACHE_TTL_SECONDS = 3600
+
 EVALUATE_PROMPT = '''\
 You are a content screener for BitLink, a social platform with a crypto-powered economy. \
 Users post about ANY topic — tech, finance, sports, art, politics, lifestyle, crypto, etc.
@@ -88,6 +97,10 @@ is valid based on the content and the stated reason. Respond with ONLY valid JSO
 {"verdict": "valid"|"invalid"|"escalate", "confidence": 0.0-1.0, "reason": "brief explanation"}
 Use "escalate" when you are unsure (confidence < 0.6).'''
 
+# System messages are identical on every call; build them once (never mutated)
+_EVALUATE_SYSTEM_MESSAGE = {'role': 'system', 'content': EVALUATE_PROMPT}
+_REPORT_SYSTEM_MESSAGE = {'role': 'system', 'content': REPORT_PROMPT}
+
 
 class AIServiceError(Exception):
     def __init__(self, message: str, status_code: int = 500):
@@ -189,11 +202,8 @@ class AIService:
         """Extract JSON from LLM response, handling markdown fences."""
         text = raw.strip()
         if text.startswith('```'):
-            lines = text.split('\n')
-            text = '\n'.join(lines[1:])
-            if text.endswith('```'):
-                text = text[:-3]
-            text = text.strip()
+            # Drop the opening fence line without splitting the whole body into lines
+            text = text.partition('\n')[2].removesuffix('```').strip()
         return json.loads(text)
 
     @staticmethod
@@ -229,14 +239,14 @@ class AIService:
         user_msg = f'Post type: {post_type}\n'
         if title:
             user_msg += f'Title: {title}\n'
-        user_msg += f'Content:\n{content[:3000]}'
+        user_msg += f'Content:\n{content[:MAX_PROMPT_CONTENT_CHARS]}'
 
         for attempt in range(2):
             try:
                 temp = 0.2 if attempt == 0 else 0.1
                 raw = await self._chat(
                     messages=[
-                        {'role': 'system', 'content': EVALUATE_PROMPT},
+                        _EVALUATE_SYSTEM_MESSAGE,
                         {'role': 'user', 'content': user_msg},
                     ],
                     feature='evaluate',
@@ -272,15 +282,25 @@ class AIService:
     ) -> ReportVerdict:
         """Judge whether a user report is valid."""
         user_msg = (
-            f'Reported content:\n{post_content[:3000]}\n\n'
+            f'Reported content:\n{post_content[:MAX_PROMPT_CONTENT_CHARS]}\n\n'
             f'Report reason: {report_reason}'
         )
 
+        cache_key = 'ai:verdict:' + hashlib.blake2b(user_msg.encode(), digest_size=16).hexdigest()
+        try:
+            redis = await get_redis()
+            cached = await redis.get(cache_key)
+        except RedisError:
+            logger.warning('Verdict cache read failed', exc_info=True)
+            cached = None
+        if cached is not None:
+            return ReportVerdict.model_validate_json(cached)
+
         for attempt in range(2):
             try:
                 raw = await self._chat(
                     messages=[
-                        {'role': 'system', 'content': REPORT_PROMPT},
+                        _REPORT_SYSTEM_MESSAGE,
                         {'role': 'user', 'content': user_msg},
                     ],
                     feature='report',
@@ -291,10 +311,11 @@ class AIService:
                     db=db,
                 )
                 data = self._parse_json(raw)
-                return ReportVerdict(**data)
+                verdict = ReportVerdict(**data)
             except (json.JSONDecodeError, TypeError, ValueError):
                 if attempt == 0:
                     continue
+                # Not cached: a later identical report should get a real verdict
                 return ReportVerdict(
                     verdict='escalate', confidence=0.0,
                     reason='AI could not evaluate — escalated for human review',
@@ -304,5 +325,12 @@ class AIService:
                     continue
                 raise
 
+            try:
+                redis = await get_redis()
+                await redis.set(cache_key, verdict.model_dump_json(), ex=VERDICT_CACHE_TTL_SECONDS)
+            except RedisError:
+                logger.warning('Verdict cache write failed', exc_info=True)
+            return verdict
+
 
 ai_service = AIService()
@@ -1,10 +1,11 @@
 """Chat service with message permission logic."""
 from enum import Enum
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_, exists, literal
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User, Follow
 from app.models.chat import ChatSession, ChatMember, Message
+from app.services.follow_cache import get_cached_follow, cache_follow
 
 
 class MessagePermission(str, Enum):
@@ -14,60 +15,73 @@ class MessagePermission(str, Enum):
     FOLLOW_REQUIRED = 'follow_required'  # Must follow to message
 
 
+def _dm_session_clause(user1_id: int, user2_id: int):
+    """Non-group session both users belong to.
+
+    Intersects each user's session ids: two (user_id, session_id) index range scans
+    instead of grouping every session either user is in.
+    """
+    user1_sessions = select(ChatMember.session_id).where(ChatMember.user_id == user1_id)
+    user2_sessions = select(ChatMember.session_id).where(ChatMember.user_id == user2_id)
+    return and_(
+        ChatSession.is_group == False,
+        ChatSession.id.in_(user1_sessions.intersect(user2_sessions))
+    )
+
+
 class ChatService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
     async def check_follow(self, follower_id: int, following_id: int) -> bool:
-        """Check if follower_id follows following_id."""
-        result = await self.db.execute(
-            select(Follow).where(
-                and_(Follow.follower_id == follower_id, Follow.following_id == following_id)
+        """Check if follower_id follows following_id, from the follow cache when it can."""
+        cached, version = await get_cached_follow(follower_id, following_id)
+        if cached is not None:
+            return cached
+        follows = await self.db.scalar(
+            select(
+                exists().where(
+                    and_(Follow.follower_id == follower_id, Follow.following_id == following_id)
+                )
             )
         )
-        return result.scalar_one_or_none() is not None
+        await cache_follow(follower_id, following_id, follows, version)
+        return follows
 
     async def get_dm_session(self, user1_id: int, user2_id: int) -> ChatSession | None:
         """Find existing DM session between two users."""
-        # Find sessions where both are members and it's not a group
-        result = await self.db.execute(
-            select(ChatSession)
-            .join(ChatMember)
-            .where(
-                and_(
-                    ChatSession.is_group == False,
-                    ChatMember.user_id.in_([user1_id, user2_id])
-                )
-            )
-            .group_by(ChatSession.id)
-            .having(func.count(ChatMember.user_id.distinct()) == 2)
-        )
+        result = await self.db.execute(select(ChatSession).where(_dm_session_clause(user1_id, user2_id)))
         return result.scalar_one_or_none()
 
     async def has_recipient_replied(self, session_id: int, initiator_id: int) -> bool:
         """Check if the other person has sent any message in this session."""
-        result = await self.db.execute(
-            select(func.count()).where(
-                and_(
-                    Message.session_id == session_id,
-                    Message.sender_id != initiator_id
+        # EXISTS stops at the first reply instead of counting them all
+        return await self.db.scalar(
+            select(
+                exists().where(
+                    and_(
+                        Message.session_id == session_id,
+                        Message.sender_id != initiator_id
+                    )
                 )
             )
         )
-        count = result.scalar_one()
-        return count > 0
 
-    async def initiator_message_count(self, session_id: int, initiator_id: int) -> int:
-        """Count messages sent by initiator before recipient replied."""
+    async def message_flags(self, session_id: int, initiator_id: int) -> tuple[bool, bool]:
+        """(initiator has sent a message, anyone else has) in one round trip.
+
+        Permission only needs zero vs non-zero, so each side is an EXISTS that
+        stops at its first match.
+        """
+        in_session = Message.session_id == session_id
         result = await self.db.execute(
-            select(func.count()).where(
-                and_(
-                    Message.session_id == session_id,
-                    Message.sender_id == initiator_id
-                )
+            select(
+                exists().where(and_(in_session, Message.sender_id == initiator_id)),
+                exists().where(and_(in_session, Message.sender_id != initiator_id)),
             )
         )
-        return result.scalar_one()
+        initiator_sent, other_sent = result.one()
+        return initiator_sent, other_sent
 
     async def get_message_permission(
         self, sender_id: int, recipient_id: int
@@ -82,28 +96,42 @@ class ChatService:
         4. No prior message → 1 message allowed (cold outreach)
         5. Already sent 1 msg and no reply → waiting
         """
-        recipient_follows_sender = await self.check_follow(recipient_id, sender_id)
+        # A cached follow answers without touching the database
+        cached_follow, follow_version = await get_cached_follow(recipient_id, sender_id)
+        if cached_follow:
+            return MessagePermission.ALLOWED, 'They follow you'
+
+        # The follow check and the DM lookup are independent; one round trip answers
+        # both. The one-row FROM keeps the follow flag when there is no session
+        result = await self.db.execute(
+            select(
+                exists().where(
+                    and_(Follow.follower_id == recipient_id, Follow.following_id == sender_id)
+                ),
+                ChatSession,
+            )
+            .select_from(select(literal(1)).subquery())
+            .outerjoin(ChatSession, _dm_session_clause(sender_id, recipient_id))
+        )
+        recipient_follows_sender, session = result.one()
+        await cache_follow(recipient_id, sender_id, recipient_follows_sender, follow_version)
 
         # Recipient follows sender → unlimited
         if recipient_follows_sender:
             return MessagePermission.ALLOWED, 'They follow you'
 
-        # Check existing conversation
-        session = await self.get_dm_session(sender_id, recipient_id)
-        
         if not session:
             # No session yet - can send 1 message to start (cold outreach)
             return MessagePermission.ONE_MESSAGE, 'You can send 1 message'
 
         # Session exists - check if recipient has replied
         if session.initiated_by == sender_id:
-            # Sender initiated - check if recipient replied
-            if await self.has_recipient_replied(session.id, sender_id):
+            # Sender initiated - check if recipient replied, then if sender already sent a message
+            sender_sent, recipient_replied = await self.message_flags(session.id, sender_id)
+            if recipient_replied:
                 return MessagePermission.ALLOWED, 'Conversation started'
-            
-            # Check if sender already sent a message
-            msg_count = await self.initiator_message_count(session.id, sender_id)
-            if msg_count > 0:
+
+            if sender_sent:
                 return MessagePermission.WAITING, 'Waiting for reply'
             else:
                 return MessagePermission.ONE_MESSAGE, 'You can send 1 message'
@@ -122,17 +150,15 @@ class ChatService:
         if session.is_group:
             return True, 'Group chat'
 
-        # Get the other member
-        members_result = await self.db.execute(
-            select(ChatMember).where(ChatMember.session_id == session_id)
+        # Get the other member: just their id, no member rows to hydrate and scan
+        recipient_id = await self.db.scalar(
+            select(ChatMember.user_id)
+            .where(ChatMember.session_id == session_id, ChatMember.user_id != sender_id)
+            .limit(1)
         )
-        members = members_result.scalars().all()
-        other_member = next((m for m in members if m.user_id != sender_id), None)
-        
-        if not other_member:
+        if recipient_id is None:
             return False, 'Invalid session'
 
-        recipient_id = other_member.user_id
         permission, reason = await self.get_message_permission(sender_id, recipient_id)
 
         if permission == MessagePermission.ALLOWED:
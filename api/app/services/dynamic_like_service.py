@@ -14,15 +14,19 @@ Rate Limiting:
 - Max 15 likes per hour per user (post + comment combined)
 - Prevents bot spray-and-pray attacks on early positions
 """
+from collections import defaultdict
 from datetime import date, datetime, timedelta
-from sqlalchemy import select, func
+from sqlalchemy import select, func, and_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
 from app.config import settings
 from app.models.user import User
 from app.models.post import Post, PostLike, Comment, CommentLike, InteractionStatus, PostStatus
 from app.models.ledger import Ledger, ActionType, RefType
 from app.models.revenue import PlatformRevenue
+from app.services.ledger_service import LedgerService, InsufficientBalance
 
 # Revenue split (platform % configurable via PLATFORM_SHARE_PCT env var)
 PLATFORM_SHARE = settings.platform_share_pct / 100
@@ -37,14 +41,13 @@ POST_LIKE_COST_MIN = 10
 COMMENT_LIKE_COST_BASE = 3
 COMMENT_LIKE_COST_MIN = 3
 
+# Like counts below this are priced from precomputed tables
+LIKE_COST_TABLE_SIZE = 10_000
+
 # Rate limiting
 LIKES_PER_HOUR_LIMIT = 15
 
 
-class InsufficientBalance(Exception):
-    pass
-
-
 class AlreadyLiked(Exception):
     pass
 
@@ -71,7 +74,9 @@ def like_cost(current_likes: int) -> int:
     | 100   | 100  |
     | 500   | 223  |
     """
-    return max(POST_LIKE_COST_MIN, int(POST_LIKE_COST_BASE * (1 + current_likes) ** 0.5))
+    if 0 <= current_likes < LIKE_COST_TABLE_SIZE:
+        return _POST_LIKE_COSTS[current_likes]
+    return _post_like_cost(current_likes)
 
 
 def comment_like_cost(current_likes: int) -> int:
@@ -86,9 +91,24 @@ def comment_like_cost(current_likes: int) -> int:
     |  10   |   9  |
     |  50+  |  21  |
     """
+    if 0 <= current_likes < LIKE_COST_TABLE_SIZE:
+        return _COMMENT_LIKE_COSTS[current_likes]
+    return _comment_like_cost(current_likes)
+
+
+def _post_like_cost(current_likes: int) -> int:
+    return max(POST_LIKE_COST_MIN, int(POST_LIKE_COST_BASE * (1 + current_likes) ** 0.5))
+
+
+def _comment_like_cost(current_likes: int) -> int:
     return max(COMMENT_LIKE_COST_MIN, int(COMMENT_LIKE_COST_BASE * (1 + current_likes) ** 0.5))
 
 
+# The curves are pure functions of the like count, so build them once at import
+_POST_LIKE_COSTS = tuple(_post_like_cost(n) for n in range(LIKE_COST_TABLE_SIZE))
+_COMMENT_LIKE_COSTS = tuple(_comment_like_cost(n) for n in range(LIKE_COST_TABLE_SIZE))
+
+
 def liker_weight(cost_paid: int, like_rank: int) -> float:
     """Equal weight (1.0). Early advantage comes from paying less and earning longer."""
     return 1.0
@@ -99,28 +119,28 @@ class DynamicLikeService:
 
     def __init__(self, db: AsyncSession):
         self.db = db
+        # Balance changes go through the ledger's guarded UPDATEs, never ORM read-modify-write
+        self.ledger = LedgerService(db)
 
     async def check_like_rate_limit(self, user_id: int) -> None:
         """Raises RateLimitExceeded if user exceeded 15 likes/hour."""
         one_hour_ago = datetime.utcnow() - timedelta(hours=1)
 
-        post_likes_result = await self.db.execute(
+        # Post and comment likes in the window, counted in one round trip
+        post_likes = (
             select(func.count()).select_from(PostLike).where(
                 PostLike.user_id == user_id,
                 PostLike.created_at > one_hour_ago
-            )
+            ).scalar_subquery()
         )
-        post_likes_count = post_likes_result.scalar() or 0
-
-        comment_likes_result = await self.db.execute(
+        comment_likes = (
             select(func.count()).select_from(CommentLike).where(
                 CommentLike.user_id == user_id,
                 CommentLike.created_at > one_hour_ago
-            )
+            ).scalar_subquery()
         )
-        comment_likes_count = comment_likes_result.scalar() or 0
+        total_likes = await self.db.scalar(select(post_likes + comment_likes)) or 0
 
-        total_likes = post_likes_count + comment_likes_count
         if total_likes >= LIKES_PER_HOUR_LIMIT:
             raise RateLimitExceeded(
                 f'Like limit reached ({LIKES_PER_HOUR_LIMIT}/hour). '
@@ -142,22 +162,21 @@ class DynamicLikeService:
         """
         await self.check_like_rate_limit(user_id)
 
-        post = await self.db.get(Post, post_id)
-        if not post:
+        # Post, liker and any existing like in one round-trip
+        row = (await self.db.execute(
+            select(Post, User, PostLike.id)
+            .select_from(Post)
+            .outerjoin(User, User.id == user_id)
+            .outerjoin(PostLike, and_(PostLike.post_id == Post.id, PostLike.user_id == user_id))
+            .where(Post.id == post_id)
+        )).one_or_none()
+        if not row:
             raise ValueError(f'Post {post_id} not found')
 
-        existing_result = await self.db.execute(
-            select(PostLike).where(
-                PostLike.post_id == post_id,
-                PostLike.user_id == user_id
-            )
-        )
-        existing_like = existing_result.scalar_one_or_none()
-
-        if existing_like:
+        post, user, existing_like_id = row
+        if existing_like_id:
             raise AlreadyLiked('Already liked this post')
 
-        user = await self.db.get(User, user_id)
         if not user:
             raise ValueError(f'User {user_id} not found')
 
@@ -168,15 +187,40 @@ class DynamicLikeService:
                 f'Need {cost} sat but only have {user.available_balance}'
             )
 
-        # Deduct from liker
-        user.available_balance -= cost
-        await self._create_ledger(
+        weight = liker_weight(cost, post.likes_count + 1)
+
+        # Create like record (immediately SETTLED) before touching balances.
+        # ON CONFLICT catches a concurrent double-click that slipped past the check above.
+        like_id = (await self.db.execute(
+            pg_insert(PostLike)
+            .values(
+                post_id=post_id,
+                user_id=user_id,
+                cost_paid=cost,
+                total_weight=weight,
+                status=InteractionStatus.SETTLED.value,
+                locked_until=None,
+                recipient_id=post.author_id,
+                w_trust=1.0,
+                n_novelty=1.0,
+                s_source=1.0,
+                ce_entropy=1.0,
+                cross_circle=1.0,
+                cabal_penalty=1.0,
+            )
+            .on_conflict_do_nothing(constraint='uq_post_like')
+            .returning(PostLike.id)
+        )).scalar_one_or_none()
+        if like_id is None:
+            raise AlreadyLiked('Already liked this post')
+
+        # Deduct from liker; the check above only fails fast, this one is authoritative
+        balance_after = await self.ledger.debit(user_id, cost)
+        self._create_ledger(
             user_id, -cost, ActionType.SPEND_LIKE,
-            RefType.POST, post_id, f'liked post {post_id}'
+            RefType.POST, post_id, f'liked post {post_id}', balance_after,
         )
 
-        weight = liker_weight(cost, post.likes_count + 1)
-
         # Revenue split
         author_share = int(cost * AUTHOR_SHARE)
         liker_pool_share = int(cost * EARLY_LIKER_SHARE)
@@ -189,48 +233,35 @@ class DynamicLikeService:
             liker_pool_share = 0
 
         # Pay author instantly
-        if post.author_id:
-            author = await self.db.get(User, post.author_id)
-            if author and author_share > 0:
-                author.available_balance += author_share
-                await self._create_ledger(
-                    post.author_id, author_share, ActionType.EARN_LIKE,
-                    RefType.POST, post_id,
-                    f'like from user {user_id}'
-                )
-
-        # Accumulate liker share in pool
-        post.revenue_pool += liker_pool_share
+        if post.author_id and author_share > 0:
+            balance_after = await self.ledger.credit(post.author_id, author_share)
+            self._create_ledger(
+                post.author_id, author_share, ActionType.EARN_LIKE,
+                RefType.POST, post_id,
+                f'like from user {user_id}', balance_after,
+            )
 
         # Platform revenue
         await self._add_platform_revenue(platform_share)
 
-        # Create like record (immediately SETTLED)
-        new_like = PostLike(
-            post_id=post_id,
-            user_id=user_id,
-            cost_paid=cost,
-            total_weight=weight,
-            status=InteractionStatus.SETTLED.value,
-            locked_until=None,
-            recipient_id=post.author_id,
-            w_trust=1.0,
-            n_novelty=1.0,
-            s_source=1.0,
-            ce_entropy=1.0,
-            cross_circle=1.0,
-            cabal_penalty=1.0,
-        )
-        self.db.add(new_like)
-
-        post.likes_count += 1
+        # Bump count and accumulate liker share in SQL so concurrent likes don't lose updates
+        likes_count = (await self.db.execute(
+            update(Post)
+            .where(Post.id == post_id)
+            .values(
+                likes_count=Post.likes_count + 1,
+                revenue_pool=Post.revenue_pool + liker_pool_share,
+            )
+            .returning(Post.likes_count)
+        )).scalar_one()
 
         await self.db.flush()
 
         return {
             'cost': cost,
             'weight': weight,
-            'like_rank': post.likes_count,
+            'likes_count': likes_count,
+            'like_rank': likes_count,
             'status': InteractionStatus.SETTLED.value,
         }
 
@@ -251,22 +282,24 @@ class DynamicLikeService:
         """
         await self.check_like_rate_limit(user_id)
 
-        comment = await self.db.get(Comment, comment_id)
-        if not comment:
-            raise ValueError(f'Comment {comment_id} not found')
-
-        existing_result = await self.db.execute(
-            select(CommentLike).where(
-                CommentLike.comment_id == comment_id,
-                CommentLike.user_id == user_id
+        # Comment, liker and any existing like in one round-trip
+        row = (await self.db.execute(
+            select(Comment, User, CommentLike.id)
+            .select_from(Comment)
+            .outerjoin(User, User.id == user_id)
+            .outerjoin(
+                CommentLike,
+                and_(CommentLike.comment_id == Comment.id, CommentLike.user_id == user_id),
             )
-        )
-        existing_like = existing_result.scalar_one_or_none()
+            .where(Comment.id == comment_id)
+        )).one_or_none()
+        if not row:
+            raise ValueError(f'Comment {comment_id} not found')
 
-        if existing_like:
+        comment, user, existing_like_id = row
+        if existing_like_id:
             raise AlreadyLiked('Already liked this comment')
 
-        user = await self.db.get(User, user_id)
         if not user:
             raise ValueError(f'User {user_id} not found')
 
@@ -277,15 +310,32 @@ class DynamicLikeService:
                 f'Need {cost} sat but only have {user.available_balance}'
             )
 
-        # Deduct from liker
-        user.available_balance -= cost
-        await self._create_ledger(
+        weight = liker_weight(cost, comment.likes_count + 1)
+
+        # Create like record (immediately SETTLED) before touching balances
+        like_id = (await self.db.execute(
+            pg_insert(CommentLike)
+            .values(
+                comment_id=comment_id,
+                user_id=user_id,
+                cost_paid=cost,
+                status=InteractionStatus.SETTLED.value,
+                locked_until=None,
+                recipient_id=comment.author_id,
+            )
+            .on_conflict_do_nothing(constraint='uq_comment_like')
+            .returning(CommentLike.id)
+        )).scalar_one_or_none()
+        if like_id is None:
+            raise AlreadyLiked('Already liked this comment')
+
+        # Deduct from liker; the check above only fails fast, this one is authoritative
+        balance_after = await self.ledger.debit(user_id, cost)
+        self._create_ledger(
             user_id, -cost, ActionType.SPEND_COMMENT_LIKE,
-            RefType.COMMENT, comment_id, f'liked comment {comment_id}'
+            RefType.COMMENT, comment_id, f'liked comment {comment_id}', balance_after,
         )
 
-        weight = liker_weight(cost, comment.likes_count + 1)
-
         # Revenue split
         author_share = int(cost * AUTHOR_SHARE)
         liker_pool_share = int(cost * EARLY_LIKER_SHARE)
@@ -297,41 +347,35 @@ class DynamicLikeService:
             liker_pool_share = 0
 
         # Pay comment author instantly
-        if comment.author_id:
-            author = await self.db.get(User, comment.author_id)
-            if author and author_share > 0:
-                author.available_balance += author_share
-                await self._create_ledger(
-                    comment.author_id, author_share, ActionType.EARN_COMMENT,
-                    RefType.COMMENT, comment_id,
-                    f'comment like from user {user_id}'
-                )
-
-        # Accumulate liker share in pool
-        comment.revenue_pool += liker_pool_share
+        if comment.author_id and author_share > 0:
+            balance_after = await self.ledger.credit(comment.author_id, author_share)
+            self._create_ledger(
+                comment.author_id, author_share, ActionType.EARN_COMMENT,
+                RefType.COMMENT, comment_id,
+                f'comment like from user {user_id}', balance_after,
+            )
 
         # Platform revenue
         await self._add_platform_revenue(platform_share)
 
-        # Create like record (immediately SETTLED)
-        new_like = CommentLike(
-            comment_id=comment_id,
-            user_id=user_id,
-            cost_paid=cost,
-            status=InteractionStatus.SETTLED.value,
-            locked_until=None,
-            recipient_id=comment.author_id,
-        )
-        self.db.add(new_like)
-
-        comment.likes_count += 1
+        # Bump count and accumulate liker share in SQL so concurrent likes don't lose updates
+        likes_count = (await self.db.execute(
+            update(Comment)
+            .where(Comment.id == comment_id)
+            .values(
+                likes_count=Comment.likes_count + 1,
+                revenue_pool=Comment.revenue_pool + liker_pool_share,
+            )
+            .returning(Comment.likes_count)
+        )).scalar_one()
 
         await self.db.flush()
 
         return {
             'cost': cost,
             'weight': weight,
-            'like_rank': comment.likes_count,
+            'likes_count': likes_count,
+            'like_rank': likes_count,
             'status': InteractionStatus.SETTLED.value,
         }
 
@@ -347,8 +391,10 @@ class DynamicLikeService:
         posts_result = await self.db.execute(
             select(Post).where(Post.revenue_pool > 0).limit(batch_size)
         )
-        for post in posts_result.scalars():
-            distributed = await self._distribute_post_pool(post)
+        posts = list(posts_result.scalars())
+        post_likers = await self._settled_likers(PostLike, PostLike.post_id, [p.id for p in posts])
+        for post in posts:
+            distributed = await self._distribute_post_pool(post, post_likers.get(post.id, []))
             if distributed > 0:
                 posts_distributed += 1
                 total_sat_distributed += distributed
@@ -357,8 +403,12 @@ class DynamicLikeService:
         comments_result = await self.db.execute(
             select(Comment).where(Comment.revenue_pool > 0).limit(batch_size)
         )
-        for comment in comments_result.scalars():
-            distributed = await self._distribute_comment_pool(comment)
+        comments = list(comments_result.scalars())
+        comment_likers = await self._settled_likers(
+            CommentLike, CommentLike.comment_id, [c.id for c in comments]
+        )
+        for comment in comments:
+            distributed = await self._distribute_comment_pool(comment, comment_likers.get(comment.id, []))
             if distributed > 0:
                 comments_distributed += 1
                 total_sat_distributed += distributed
@@ -369,19 +419,31 @@ class DynamicLikeService:
             'total_sat_distributed': total_sat_distributed,
         }
 
-    async def _distribute_post_pool(self, post: Post) -> int:
-        """Distribute a post's revenue_pool equally among its likers. Returns sat distributed."""
-        pool = post.revenue_pool
-        if pool <= 0:
-            return 0
+    async def _settled_likers(self, like_model, target_col, target_ids: list[int]) -> dict[int, list]:
+        """Settled likes (of existing users) for a batch of posts/comments, keyed by target id.
 
+        One query for the whole batch instead of a likes query per post.
+        """
+        if not target_ids:
+            return {}
         result = await self.db.execute(
-            select(PostLike).where(
-                PostLike.post_id == post.id,
-                PostLike.status == InteractionStatus.SETTLED.value
+            select(like_model)
+            .join(User, User.id == like_model.user_id)
+            .where(
+                target_col.in_(target_ids),
+                like_model.status == InteractionStatus.SETTLED.value,
             )
         )
-        likers = list(result.scalars().all())
+        likers: dict[int, list] = defaultdict(list)
+        for like in result.scalars():
+            likers[getattr(like, target_col.key)].append(like)
+        return likers
+
+    async def _distribute_post_pool(self, post: Post, likers: list[PostLike]) -> int:
+        """Distribute a post's revenue_pool equally among its likers. Returns sat distributed."""
+        pool = post.revenue_pool
+        if pool <= 0:
+            return 0
 
         if not likers:
             return 0
@@ -390,35 +452,31 @@ class DynamicLikeService:
         if share_each == 0:
             return 0
 
-        distributed = 0
+        balances = await self.ledger.credit_many({like.user_id: share_each for like in likers})
         for like in likers:
-            user = await self.db.get(User, like.user_id)
-            if user:
-                user.available_balance += share_each
-                like.earnings += share_each
-                distributed += share_each
-                await self._create_ledger(
-                    like.user_id, share_each, ActionType.EARN_LIKE,
-                    RefType.POST, post.id, 'early supporter dividend'
-                )
+            like.earnings += share_each
+            self._create_ledger(
+                like.user_id, share_each, ActionType.EARN_LIKE,
+                RefType.POST, post.id, 'early supporter dividend',
+                balances[like.user_id],
+            )
 
-        post.revenue_pool -= distributed
+        # Subtract in SQL: likes committed since the post was loaded keep their pool share
+        distributed = share_each * len(likers)
+        await self.db.execute(
+            update(Post)
+            .where(Post.id == post.id)
+            .values(revenue_pool=Post.revenue_pool - distributed)
+            .execution_options(synchronize_session=False)
+        )
         return distributed
 
-    async def _distribute_comment_pool(self, comment: Comment) -> int:
+    async def _distribute_comment_pool(self, comment: Comment, likers: list[CommentLike]) -> int:
         """Distribute a comment's revenue_pool equally among its likers."""
         pool = comment.revenue_pool
         if pool <= 0:
             return 0
 
-        result = await self.db.execute(
-            select(CommentLike).where(
-                CommentLike.comment_id == comment.id,
-                CommentLike.status == InteractionStatus.SETTLED.value
-            )
-        )
-        likers = list(result.scalars().all())
-
         if not likers:
             return 0
 
@@ -426,18 +484,21 @@ class DynamicLikeService:
         if share_each == 0:
             return 0
 
-        distributed = 0
+        balances = await self.ledger.credit_many({like.user_id: share_each for like in likers})
         for like in likers:
-            user = await self.db.get(User, like.user_id)
-            if user:
-                user.available_balance += share_each
-                distributed += share_each
-                await self._create_ledger(
-                    like.user_id, share_each, ActionType.EARN_COMMENT,
-                    RefType.COMMENT, comment.id, 'early comment supporter dividend'
-                )
+            self._create_ledger(
+                like.user_id, share_each, ActionType.EARN_COMMENT,
+                RefType.COMMENT, comment.id, 'early comment supporter dividend',
+                balances[like.user_id],
+            )
 
-        comment.revenue_pool -= distributed
+        distributed = share_each * len(likers)
+        await self.db.execute(
+            update(Comment)
+            .where(Comment.id == comment.id)
+            .values(revenue_pool=Comment.revenue_pool - distributed)
+            .execution_options(synchronize_session=False)
+        )
         return distributed
 
     # ========== Status / Query Methods ==========
@@ -478,21 +539,25 @@ class DynamicLikeService:
 
     async def get_post_likers(self, post_id: int) -> list[dict]:
         """Get list of likers for a post with their weights and potential earnings."""
+        # Only the columns the response uses: plain rows, no PostLike instances to build
         result = await self.db.execute(
-            select(PostLike).where(PostLike.post_id == post_id)
+            select(
+                PostLike.user_id, User.name, PostLike.cost_paid,
+                PostLike.total_weight, PostLike.earnings, PostLike.created_at,
+            )
+            .outerjoin(User, User.id == PostLike.user_id)
+            .where(PostLike.post_id == post_id)
         )
-        likes = list(result.scalars().all())
 
         likers = []
-        for like in likes:
-            user = await self.db.get(User, like.user_id)
+        for user_id, username, cost_paid, weight, earnings, created_at in result:
             likers.append({
-                'user_id': like.user_id,
-                'username': user.name if user else 'unknown',
-                'cost_paid': like.cost_paid,
-                'weight': like.total_weight,
-                'earnings': like.earnings,
-                'created_at': like.created_at.isoformat(),
+                'user_id': user_id,
+                'username': username or 'unknown',
+                'cost_paid': cost_paid,
+                'weight': weight,
+                'earnings': earnings,
+                'created_at': created_at.isoformat(),
             })
 
         return likers
@@ -529,11 +594,18 @@ class DynamicLikeService:
         )
         refund_summary['settled_likes'] = result.scalar() or 0
 
-        # 2. Forfeit undistributed pool to platform
+        # 2. Forfeit undistributed pool to platform. Subtract what was read rather
+        # than writing 0, so a like committing meanwhile isn't silently zeroed
         if post.revenue_pool > 0:
-            refund_summary['pool_forfeited'] = post.revenue_pool
-            await self._add_platform_revenue(post.revenue_pool)
-            post.revenue_pool = 0
+            forfeited = post.revenue_pool
+            refund_summary['pool_forfeited'] = forfeited
+            await self._add_platform_revenue(forfeited)
+            await self.db.execute(
+                update(Post)
+                .where(Post.id == post_id)
+                .values(revenue_pool=Post.revenue_pool - forfeited)
+                .execution_options(synchronize_session=False)
+            )
 
         # 3. Claw back author earnings from this post
         earn_result = await self.db.execute(
@@ -549,39 +621,46 @@ class DynamicLikeService:
         clawback_total = sum(e.amount for e in author_earnings)
 
         if clawback_total > 0:
-            author = await self.db.get(User, author_id)
-            if author:
-                actual_clawback = min(clawback_total, author.available_balance)
-                if actual_clawback > 0:
-                    author.available_balance -= actual_clawback
-                    await self._create_ledger(
-                        author_id, -actual_clawback, ActionType.FINE,
-                        RefType.POST, post_id,
-                        'earnings clawback — post deleted',
-                    )
-                    refund_summary['author_clawback'] = actual_clawback
-
-        # 4. Forfeit comment pools on this post
+            # Lock the row so the balance can't move between reading it and the debit
+            balance = await self.db.scalar(
+                select(User.available_balance).where(User.id == author_id).with_for_update()
+            )
+            actual_clawback = min(clawback_total, balance or 0)
+            if actual_clawback > 0:
+                balance_after = await self.ledger.debit(author_id, actual_clawback)
+                self._create_ledger(
+                    author_id, -actual_clawback, ActionType.FINE,
+                    RefType.POST, post_id,
+                    'earnings clawback — post deleted', balance_after,
+                )
+                refund_summary['author_clawback'] = actual_clawback
+
+        # 4. Forfeit comment pools on this post. Most comments have an empty pool,
+        # so load only those that don't, and credit the platform once for all of them.
+        # The rows stay locked until commit, so zeroing them can't drop a concurrent like's share
         comments_result = await self.db.execute(
-            select(Comment).where(Comment.post_id == post_id)
+            select(Comment)
+            .options(load_only(Comment.id, Comment.revenue_pool))
+            .where(Comment.post_id == post_id, Comment.revenue_pool > 0)
+            .with_for_update()
         )
+        comment_pools = 0
         for comment in comments_result.scalars():
-            if comment.revenue_pool > 0:
-                await self._add_platform_revenue(comment.revenue_pool)
-                refund_summary['pool_forfeited'] += comment.revenue_pool
-                comment.revenue_pool = 0
+            comment_pools += comment.revenue_pool
+            comment.revenue_pool = 0
+        if comment_pools:
+            await self._add_platform_revenue(comment_pools)
+            refund_summary['pool_forfeited'] += comment_pools
 
         # 5. Handle bounty refund (question with unaccepted bounty)
         if post.bounty and post.bounty > 0:
-            author = await self.db.get(User, author_id)
-            if author:
-                author.available_balance += post.bounty
-                await self._create_ledger(
-                    author_id, post.bounty, ActionType.REFUND_CANCEL,
-                    RefType.POST, post_id,
-                    'bounty refund — question deleted',
-                )
-                refund_summary['bounty_refunded'] = post.bounty
+            balance_after = await self.ledger.credit(author_id, post.bounty)
+            self._create_ledger(
+                author_id, post.bounty, ActionType.REFUND_CANCEL,
+                RefType.POST, post_id,
+                'bounty refund — question deleted', balance_after,
+            )
+            refund_summary['bounty_refunded'] = post.bounty
 
         # 6. Soft-delete the post
         post.status = PostStatus.DELETED.value
@@ -590,7 +669,7 @@ class DynamicLikeService:
 
     # ========== Internal Helpers ==========
 
-    async def _create_ledger(
+    def _create_ledger(
         self,
         user_id: int,
         amount: int,
@@ -598,13 +677,13 @@ class DynamicLikeService:
         ref_type: RefType,
         ref_id: int,
         note: str,
+        balance_after: int,
     ) -> Ledger:
         """Create a ledger entry."""
-        user = await self.db.get(User, user_id)
         entry = Ledger(
             user_id=user_id,
             amount=amount,
-            balance_after=user.available_balance,
+            balance_after=balance_after,
             action_type=action_type.value,
             ref_type=ref_type.value,
             ref_id=ref_id,
@@ -618,16 +697,15 @@ class DynamicLikeService:
         if amount <= 0:
             return
 
-        today = date.today()
-        result = await self.db.execute(
-            select(PlatformRevenue).where(PlatformRevenue.date == today)
+        # One upsert: concurrent likes can't both insert today's row or lose increments
+        await self.db.execute(
+            pg_insert(PlatformRevenue)
+            .values(date=date.today(), like_revenue=amount, total=amount)
+            .on_conflict_do_update(
+                index_elements=[PlatformRevenue.date],
+                set_={
+                    'like_revenue': PlatformRevenue.like_revenue + amount,
+                    'total': PlatformRevenue.total + amount,
+                },
+            )
         )
-        revenue = result.scalar_one_or_none()
-
-        if not revenue:
-            revenue = PlatformRevenue(date=today)
-            self.db.add(revenue)
-            await self.db.flush()
-
-        revenue.like_revenue += amount
-        revenue.total += amount
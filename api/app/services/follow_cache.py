@@ -0,0 +1,84 @@
+"""Redis cache for follow-relationship checks.
+
+DM permission checks ask "does A follow B?" before every cold message, while
+follows change rarely. Each cached answer is stamped with a per-pair version
+that follow/unfollow replaces after commit. A check that read the database
+before the change therefore can't store a stale answer under the new version.
+The TTL only bounds how long an unused entry lingers. Cache failures always
+fall back to the database.
+"""
+import logging
+import uuid
+
+from redis.exceptions import RedisError
+
+from app.services.redis_service import get_redis
+
+logger = logging.getLogger(__name__)
+
+FOLLOW_CACHE_TTL_SECONDS = 3600
+# Outlives every entry stamped before it was set; when it lapses the version
+# reads as '0' again, and any '0' entry from before the first change is long gone
+FOLLOW_VERSION_TTL_SECONDS = 2 * FOLLOW_CACHE_TTL_SECONDS
+
+
+def _follow_cache_key(follower_id: int, following_id: int) -> str:
+    return f'follow:{follower_id}:{following_id}'
+
+
+def _follow_version_key(follower_id: int, following_id: int) -> str:
+    return f'follow_version:{follower_id}:{following_id}'
+
+
+async def get_cached_follow(follower_id: int, following_id: int) -> tuple[bool | None, str | None]:
+    """Return (cached answer or None on miss, current version).
+
+    Read the version before querying the database and pass it to cache_follow.
+    """
+    try:
+        redis = await get_redis()
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.get(_follow_version_key(follower_id, following_id))
+            pipe.get(_follow_cache_key(follower_id, following_id))
+            version, cached = await pipe.execute()
+    except RedisError:
+        logger.warning('Follow cache read failed', exc_info=True)
+        return None, None
+    version = version or '0'
+    if cached is None:
+        return None, version
+    stamp, _, flag = cached.partition(':')
+    if stamp != version:
+        return None, version
+    return flag == '1', version
+
+
+async def cache_follow(follower_id: int, following_id: int, follows: bool, version: str | None):
+    """Store a follow check result read from the database, stamped with the version read before it."""
+    if version is None:
+        return
+    try:
+        redis = await get_redis()
+        await redis.set(
+            _follow_cache_key(follower_id, following_id),
+            f'{version}:{1 if follows else 0}',
+            ex=FOLLOW_CACHE_TTL_SECONDS,
+        )
+    except RedisError:
+        logger.warning('Follow cache write failed', exc_info=True)
+
+
+async def invalidate_follow(follower_id: int, following_id: int):
+    """Replace the pair's version, making any cached or in-flight answer stale. Call after commit."""
+    try:
+        redis = await get_redis()
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.set(
+                _follow_version_key(follower_id, following_id),
+                uuid.uuid4().hex,
+                ex=FOLLOW_VERSION_TTL_SECONDS,
+            )
+            pipe.delete(_follow_cache_key(follower_id, following_id))
+            await pipe.execute()
+    except RedisError:
+        logger.warning('Follow cache invalidation failed', exc_info=True)
@@ -0,0 +1,115 @@
+"""Write-behind buffer for InteractionLog rows.
+
+Interaction logs feed novelty scoring; they are analytics, not money, so they
+are queued in-process and bulk-inserted in batches instead of adding a row to
+every like/comment transaction. Rows still queued when the process dies are lost.
+"""
+import asyncio
+import logging
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from app.db.database import async_session
+from app.models.reward import InteractionLog
+
+logger = logging.getLogger(__name__)
+
+# Flush when this many rows are buffered...
+FLUSH_BATCH_SIZE = 100
+# ...or this long after the first buffered row, whichever comes first
+FLUSH_INTERVAL_SECONDS = 1.0
+# Rows beyond this are dropped rather than growing memory without bound
+QUEUE_SIZE = 10_000
+
+# Queued by stop(): the flusher writes everything ahead of it, then exits
+_STOP = object()
+
+
+class InteractionLogWriter:
+    """Buffers interaction rows and inserts them from a background task."""
+
+    def __init__(self):
+        self._queue: asyncio.Queue[dict] | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        """Start the flusher. Call from app startup (needs a running loop)."""
+        self._queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._task = asyncio.create_task(self._flusher(self._queue))
+
+    async def stop(self):
+        """Stop the flusher once it has written every buffered row.
+
+        The flusher is signalled rather than cancelled, so neither the batch it
+        is collecting nor an insert in flight is lost.
+        """
+        queue, task = self._queue, self._task
+        # New rows from here on are written inline by the caller
+        self._queue = None
+        self._task = None
+        if task is None:
+            return
+        if not task.done():
+            await queue.put(_STOP)
+        await task
+
+    def log(
+        self, actor_id: int, target_user_id: int,
+        interaction_type: str, ref_id: int | None = None,
+    ) -> bool:
+        """Queue a row. Returns False if the flusher isn't running so the caller can write inline."""
+        if self._queue is None:
+            return False
+        try:
+            self._queue.put_nowait({
+                'actor_id': actor_id,
+                'target_user_id': target_user_id,
+                'interaction_type': interaction_type,
+                'ref_id': ref_id,
+                # Stamp now, not at flush time
+                'created_at': datetime.utcnow(),
+            })
+        except asyncio.QueueFull:
+            logger.warning('Interaction log queue full, dropping %s %d->%d',
+                           interaction_type, actor_id, target_user_id)
+        return True
+
+    async def _flusher(self, queue: asyncio.Queue):
+        """Collect up to FLUSH_BATCH_SIZE rows or FLUSH_INTERVAL_SECONDS, then insert."""
+        loop = asyncio.get_running_loop()
+        while True:
+            row = await queue.get()
+            if row is _STOP:
+                return
+            batch = [row]
+            stopping = False
+            deadline = loop.time() + FLUSH_INTERVAL_SECONDS
+            while len(batch) < FLUSH_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(queue.get(), timeout)
+                except TimeoutError:
+                    break
+                if row is _STOP:
+                    stopping = True
+                    break
+                batch.append(row)
+            await self._write(batch)
+            if stopping:
+                return
+
+    async def _write(self, rows: list[dict]):
+        """Insert rows in one executemany (multi-VALUES on asyncpg)."""
+        try:
+            async with async_session() as session:
+                await session.execute(insert(InteractionLog), rows)
+                await session.commit()
+        except Exception:
+            logger.exception('Failed to write %d interaction logs', len(rows))
+
+
+# Singleton instance
+interaction_log_writer = InteractionLogWriter()
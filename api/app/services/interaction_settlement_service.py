@@ -6,13 +6,16 @@ Handles the 24h lock settlement mechanism for likes and comments.
 - Called periodically by the settlement worker
 """
 from datetime import datetime
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.post import PostLike, CommentLike, Comment, InteractionStatus
 from app.models.ledger import RefType
 from app.services.ledger_service import LedgerService
 
+# Expired interactions are streamed and settled this many at a time
+SETTLEMENT_BATCH_SIZE = 500
+
 
 class InteractionSettlementService:
     """Settles locked interactions after 24h expiry."""
@@ -23,88 +26,51 @@ class InteractionSettlementService:
 
     async def settle_expired_post_likes(self) -> dict:
         """Settle all expired pending post likes."""
-        now = datetime.utcnow()
-        result = await self.db.execute(
-            select(PostLike).where(
-                PostLike.status == InteractionStatus.PENDING.value,
-                PostLike.locked_until <= now
-            )
-        )
-        likes = result.scalars().all()
-
-        settled_count = 0
-        total_amount = 0
-
-        for like in likes:
-            if like.cost_paid > 0 and like.recipient_id:
-                await self.ledger.settle_locked(
-                    amount=like.cost_paid,
-                    recipient_id=like.recipient_id,
-                    ref_type=RefType.POST_LIKE,
-                    ref_id=like.id,
-                    revenue_source='like',
-                )
-            like.status = InteractionStatus.SETTLED.value
-            settled_count += 1
-            total_amount += like.cost_paid
-
-        return {'settled': settled_count, 'total_sats': total_amount}
+        return await self._settle_expired(PostLike, PostLike.status, RefType.POST_LIKE, 'like')
 
     async def settle_expired_comment_likes(self) -> dict:
         """Settle all expired pending comment likes."""
-        now = datetime.utcnow()
-        result = await self.db.execute(
-            select(CommentLike).where(
-                CommentLike.status == InteractionStatus.PENDING.value,
-                CommentLike.locked_until <= now
-            )
-        )
-        likes = result.scalars().all()
-
-        settled_count = 0
-        total_amount = 0
-
-        for like in likes:
-            if like.cost_paid > 0 and like.recipient_id:
-                await self.ledger.settle_locked(
-                    amount=like.cost_paid,
-                    recipient_id=like.recipient_id,
-                    ref_type=RefType.COMMENT_LIKE,
-                    ref_id=like.id,
-                    revenue_source='like',
-                )
-            like.status = InteractionStatus.SETTLED.value
-            settled_count += 1
-            total_amount += like.cost_paid
-
-        return {'settled': settled_count, 'total_sats': total_amount}
+        return await self._settle_expired(CommentLike, CommentLike.status, RefType.COMMENT_LIKE, 'like')
 
     async def settle_expired_comments(self) -> dict:
         """Settle all expired pending comments."""
+        return await self._settle_expired(Comment, Comment.interaction_status, RefType.COMMENT, 'comment')
+
+    async def _settle_expired(self, model, status_col, ref_type: RefType, revenue_source: str) -> dict:
+        """Pay out and mark SETTLED every expired pending row of model.
+
+        The backlog is unbounded, so rows are streamed from a server-side cursor
+        SETTLEMENT_BATCH_SIZE at a time as plain (id, cost_paid, recipient_id)
+        tuples; memory stays at one batch however many rows have expired.
+        """
         now = datetime.utcnow()
-        result = await self.db.execute(
-            select(Comment).where(
-                Comment.interaction_status == InteractionStatus.PENDING.value,
-                Comment.locked_until <= now
+        result = await self.db.stream(
+            select(model.id, model.cost_paid, model.recipient_id)
+            .where(
+                status_col == InteractionStatus.PENDING.value,
+                model.locked_until <= now
             )
+            .execution_options(yield_per=SETTLEMENT_BATCH_SIZE)
         )
-        comments = result.scalars().all()
 
         settled_count = 0
         total_amount = 0
 
-        for comment in comments:
-            if comment.cost_paid > 0 and comment.recipient_id:
-                await self.ledger.settle_locked(
-                    amount=comment.cost_paid,
-                    recipient_id=comment.recipient_id,
-                    ref_type=RefType.COMMENT,
-                    ref_id=comment.id,
-                    revenue_source='comment',
-                )
-            comment.interaction_status = InteractionStatus.SETTLED.value
-            settled_count += 1
-            total_amount += comment.cost_paid
+        async for rows in result.partitions():
+            payouts = [
+                (cost_paid, recipient_id, ref_type, row_id, revenue_source)
+                for row_id, cost_paid, recipient_id in rows
+                if cost_paid > 0 and recipient_id
+            ]
+            await self.ledger.settle_locked_batch(payouts)
+            await self.db.execute(
+                update(model)
+                .where(model.id.in_([row_id for row_id, _, _ in rows]))
+                .values({status_col.key: InteractionStatus.SETTLED.value})
+                .execution_options(synchronize_session=False)
+            )
+            settled_count += len(rows)
+            total_amount += sum(cost_paid for _, cost_paid, _ in rows)
 
         return {'settled': settled_count, 'total_sats': total_amount}
 
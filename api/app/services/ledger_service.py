@@ -1,6 +1,11 @@
+from collections import defaultdict
 from datetime import date
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, update, insert, func, literal, BigInteger, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
 
 from app.models.user import User
 from app.models.ledger import Ledger, ActionType, RefType
@@ -10,6 +15,15 @@ from app.models.revenue import PlatformRevenue
 CREATOR_SHARE = 0.80
 PLATFORM_SHARE = 0.20
 
+# PlatformRevenue column credited for each revenue source; other sources only add to total
+_REVENUE_COLUMNS = {
+    'like': 'like_revenue',
+    'comment': 'comment_revenue',
+    'post': 'post_revenue',
+    'boost': 'boost_revenue',
+    'penalty': 'post_revenue',
+}
+
 
 class InsufficientBalance(Exception):
     """Raised when user doesn't have enough sat."""
@@ -35,29 +49,20 @@ class LedgerService:
         if amount <= 0:
             raise ValueError('Spend amount must be positive')
 
-        user = await self.db.get(User, user_id)
-        if not user:
-            raise ValueError(f'User {user_id} not found')
-
-        if user.available_balance < amount:
-            raise InsufficientBalance(
-                f'Need {amount} sat but only have {user.available_balance}'
-            )
-
-        user.available_balance -= amount
+        balance_after = await self.debit(user_id, amount)
 
         entry = Ledger(
             user_id=user_id,
             amount=-amount,
-            balance_after=user.available_balance,
+            balance_after=balance_after,
             action_type=action_type.value,
             ref_type=ref_type.value,
             ref_id=ref_id,
             note=note,
         )
         self.db.add(entry)
+        # flush() INSERT ... RETURNING fills id; every other column is set client-side
         await self.db.flush()
-        await self.db.refresh(entry)
         return entry
 
     async def earn(
@@ -73,16 +78,12 @@ class LedgerService:
         if amount <= 0:
             raise ValueError('Earn amount must be positive')
 
-        user = await self.db.get(User, user_id)
-        if not user:
-            raise ValueError(f'User {user_id} not found')
-
-        user.available_balance += amount
+        balance_after = await self.credit(user_id, amount)
 
         entry = Ledger(
             user_id=user_id,
             amount=amount,
-            balance_after=user.available_balance,
+            balance_after=balance_after,
             action_type=action_type.value,
             ref_type=ref_type.value,
             ref_id=ref_id,
@@ -90,9 +91,58 @@ class LedgerService:
         )
         self.db.add(entry)
         await self.db.flush()
-        await self.db.refresh(entry)
         return entry
 
+    async def debit(self, user_id: int, amount: int) -> int:
+        """Atomically take amount from the balance if it covers it. Returns the new balance.
+
+        Check and deduction are one UPDATE, so concurrent spends can't both pass the check.
+        Writes no ledger row; the caller records the movement. Raises InsufficientBalance.
+        """
+        new_balance = await self.db.scalar(
+            update(User)
+            .where(User.id == user_id, User.available_balance >= amount)
+            .values(available_balance=User.available_balance - amount)
+            .returning(User.available_balance)
+            .execution_options(synchronize_session=False)
+        )
+        if new_balance is None:
+            # Failure path only: tell a missing user from a short balance
+            balance = await self.db.scalar(
+                select(User.available_balance).where(User.id == user_id)
+            )
+            if balance is None:
+                raise ValueError(f'User {user_id} not found')
+            raise InsufficientBalance(f'Need {amount} sat but only have {balance}')
+        self._sync_loaded_balance(user_id, new_balance)
+        return new_balance
+
+    async def credit(self, user_id: int, amount: int) -> int:
+        """Atomically add amount to the balance. Returns the new balance.
+
+        Writes no ledger row; the caller records the movement.
+        """
+        new_balance = await self.db.scalar(
+            update(User)
+            .where(User.id == user_id)
+            .values(available_balance=User.available_balance + amount)
+            .returning(User.available_balance)
+            .execution_options(synchronize_session=False)
+        )
+        if new_balance is None:
+            raise ValueError(f'User {user_id} not found')
+        self._sync_loaded_balance(user_id, new_balance)
+        return new_balance
+
+    def _sync_loaded_balance(self, user_id: int, balance: int):
+        """Give an already-loaded User the balance the UPDATE returned.
+
+        The ORM's own sync would recompute it from the possibly stale in-memory value.
+        """
+        user = self.db.identity_map.get(identity_key(User, user_id))
+        if user is not None:
+            set_committed_value(user, 'available_balance', balance)
+
     async def get_balance(self, user_id: int) -> int:
         """Get current balance for a user."""
         user = await self.db.get(User, user_id)
@@ -170,32 +220,27 @@ class LedgerService:
         source: str,
     ) -> None:
         """Add revenue to today's platform pool."""
-        today = date.today()
-
-        # Get or create today's record
-        result = await self.db.execute(
-            select(PlatformRevenue).where(PlatformRevenue.date == today)
+        await self._add_platform_revenues({source: amount})
+
+    async def _add_platform_revenues(self, by_source: dict[str, int]) -> None:
+        """Add revenue from one or more sources to today's platform pool in one statement."""
+        values: dict[str, int] = defaultdict(int)
+        for source, amount in by_source.items():
+            values['total'] += amount
+            column = _REVENUE_COLUMNS.get(source)
+            if column:
+                values[column] += amount
+
+        # One upsert: concurrent first writes of the day can't both insert, and
+        # increments happen in SQL so they don't overwrite each other
+        await self.db.execute(
+            pg_insert(PlatformRevenue)
+            .values(date=date.today(), **values)
+            .on_conflict_do_update(
+                index_elements=[PlatformRevenue.date],
+                set_={col: getattr(PlatformRevenue, col) + amount for col, amount in values.items()},
+            )
         )
-        revenue = result.scalar_one_or_none()
-
-        if not revenue:
-            revenue = PlatformRevenue(date=today)
-            self.db.add(revenue)
-            await self.db.flush()
-
-        # Update the appropriate column
-        if source == 'like':
-            revenue.like_revenue += amount
-        elif source == 'comment':
-            revenue.comment_revenue += amount
-        elif source == 'post':
-            revenue.post_revenue += amount
-        elif source == 'boost':
-            revenue.boost_revenue += amount
-        elif source == 'penalty':
-            revenue.post_revenue += amount
-
-        revenue.total += amount
 
     async def lock_funds(
         self,
@@ -209,21 +254,12 @@ class LedgerService:
         if amount <= 0:
             raise ValueError('Lock amount must be positive')
 
-        user = await self.db.get(User, user_id)
-        if not user:
-            raise ValueError(f'User {user_id} not found')
-
-        if user.available_balance < amount:
-            raise InsufficientBalance(
-                f'Need {amount} sat but only have {user.available_balance}'
-            )
-
-        user.available_balance -= amount
+        balance_after = await self.debit(user_id, amount)
 
         entry = Ledger(
             user_id=user_id,
             amount=-amount,
-            balance_after=user.available_balance,
+            balance_after=balance_after,
             action_type=action_type.value,
             ref_type=ref_type.value,
             ref_id=ref_id,
@@ -231,7 +267,6 @@ class LedgerService:
         )
         self.db.add(entry)
         await self.db.flush()
-        await self.db.refresh(entry)
         return entry
 
     async def settle_locked(
@@ -266,6 +301,79 @@ class LedgerService:
 
         return author_share, platform_share
 
+    async def settle_locked_batch(
+        self,
+        items: list[tuple[int, int, RefType, int, str]],
+    ) -> None:
+        """settle_locked() for many (amount, recipient_id, ref_type, ref_id, revenue_source) items.
+
+        Same splits and ledger rows, but one UPDATE for every recipient's balance,
+        one multi-row INSERT for the ledger and one revenue upsert, instead of
+        three round trips per item.
+        """
+        payouts = []
+        credits: dict[int, int] = defaultdict(int)
+        revenue: dict[str, int] = defaultdict(int)
+        for amount, recipient_id, ref_type, ref_id, revenue_source in items:
+            if amount <= 0:
+                raise ValueError('Amount must be positive')
+            author_share = int(amount * CREATOR_SHARE)
+            platform_share = amount - author_share
+            if author_share > 0:
+                payouts.append((recipient_id, author_share, ref_type, ref_id))
+                credits[recipient_id] += author_share
+            if platform_share > 0:
+                revenue[revenue_source] += platform_share
+
+        if credits:
+            balances = await self.credit_many(credits)
+            # Walk each user's balance forward from before the batch, so every
+            # row's balance_after matches applying the payouts one at a time
+            running = {uid: balances[uid] - total for uid, total in credits.items()}
+            rows = []
+            for recipient_id, share, ref_type, ref_id in payouts:
+                running[recipient_id] += share
+                rows.append({
+                    'user_id': recipient_id,
+                    'amount': share,
+                    'balance_after': running[recipient_id],
+                    'action_type': ActionType.SETTLE_AUTHOR.value,
+                    'ref_type': ref_type.value,
+                    'ref_id': ref_id,
+                    'note': 'settled after 24h lock',
+                })
+            await self.db.execute(insert(Ledger), rows)
+
+        if revenue:
+            await self._add_platform_revenues(revenue)
+
+    async def credit_many(self, credits: dict[int, int]) -> dict[int, int]:
+        """Add to many balances in one UPDATE. Returns each user's new balance.
+
+        Writes no ledger rows; the caller records the movements.
+
+        The ids and amounts travel as two array parameters, so the SQL text is the
+        same whatever the batch size.
+        """
+        batch = select(
+            func.unnest(literal(list(credits), ARRAY(Integer))).label('user_id'),
+            func.unnest(literal(list(credits.values()), ARRAY(BigInteger))).label('amount'),
+        ).subquery()
+        result = await self.db.execute(
+            update(User)
+            .where(User.id == batch.c.user_id)
+            .values(available_balance=User.available_balance + batch.c.amount)
+            .returning(User.id, User.available_balance)
+            .execution_options(synchronize_session=False)
+        )
+        balances = dict(result.all())
+        missing = credits.keys() - balances.keys()
+        if missing:
+            raise ValueError(f'User {min(missing)} not found')
+        for user_id, balance in balances.items():
+            self._sync_loaded_balance(user_id, balance)
+        return balances
+
     async def cancel_locked(
         self,
         user_id: int,
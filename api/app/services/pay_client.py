@@ -25,6 +25,13 @@ class PayClient:
         self.base_url = settings.pay_service_url
         self.app_id = settings.pay_app_id
         self.timeout = 30.0
+        # One pooled client per process: keep-alive connections are reused across
+        # proxied calls instead of a fresh TCP/TLS setup per request
+        self.client = httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout)
+
+    async def close(self):
+        """Close pooled connections. Call from app shutdown."""
+        await self.client.aclose()
 
     async def _request(
         self,
@@ -34,28 +41,25 @@ class PayClient:
         json: Optional[dict] = None,
     ) -> dict:
         """Make HTTP request to Pay service."""
-        url = f'{self.base_url}{path}'
-
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.request(
-                    method=method,
-                    url=url,
-                    params=params,
-                    json=json,
-                )
-
-                if response.status_code >= 400:
-                    try:
-                        detail = response.json().get('detail', 'Unknown error')
-                    except Exception:
-                        detail = response.text or f'Pay service error ({response.status_code})'
-                    raise PayClientError(detail, response.status_code)
-
-                return response.json()
-
-            except httpx.RequestError as e:
-                raise PayClientError(f'Pay service unavailable: {e}', 503)
+        try:
+            response = await self.client.request(
+                method=method,
+                url=path,
+                params=params,
+                json=json,
+            )
+
+            if response.status_code >= 400:
+                try:
+                    detail = response.json().get('detail', 'Unknown error')
+                except Exception:
+                    detail = response.text or f'Pay service error ({response.status_code})'
+                raise PayClientError(detail, response.status_code)
+
+            return response.json()
+
+        except httpx.RequestError as e:
+            raise PayClientError(f'Pay service unavailable: {e}', 503)
 
     async def get_or_create_wallet(self, external_user_id: str) -> dict:
         """
@@ -281,3 +285,11 @@ def get_pay_client() -> PayClient:
     if _pay_client is None:
         _pay_client = PayClient()
     return _pay_client
+
+
+async def close_pay_client() -> None:
+    """Close the PayClient singleton's connections, if it was created."""
+    global _pay_client
+    if _pay_client:
+        await _pay_client.close()
+        _pay_client = None
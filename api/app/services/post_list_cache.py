@@ -0,0 +1,80 @@
+"""Redis cache for post list and feed pages.
+
+One Redis hash per viewer (0 = anonymous), one field per query shape. Entries
+carry the viewer's like state, so the viewer's own writes drop the whole hash.
+Every entry is also stamped with a global version that deleting or hiding a
+post bumps, so a removed post stops being served to all viewers at once. New
+posts and other users' likes only show up once the TTL lapses. Cache failures
+always fall back to the database.
+"""
+import logging
+
+from redis.exceptions import RedisError
+
+from app.services.redis_service import get_redis
+
+logger = logging.getLogger(__name__)
+
+FEED_CACHE_TTL_SECONDS = 30
+POST_LISTS_VERSION_KEY = 'post_lists:version'
+
+
+def _post_list_cache_key(viewer_id: int | None) -> str:
+    return f'feed:{viewer_id or 0}'
+
+
+async def get_cached_post_list(viewer_id: int | None, field: str) -> tuple[str | None, str | None]:
+    """Return (cached JSON page or None, current version).
+
+    Pass the version back to cache_post_list: it was read before the page is
+    built, so a post removed meanwhile makes that page stale on arrival.
+    """
+    try:
+        redis = await get_redis()
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.get(POST_LISTS_VERSION_KEY)
+            pipe.hget(_post_list_cache_key(viewer_id), field)
+            version, cached = await pipe.execute()
+    except RedisError:
+        logger.warning('Post list cache read failed', exc_info=True)
+        return None, None
+    version = version or '0'
+    if cached is None:
+        return None, version
+    stamp, _, body = cached.partition(':')
+    if stamp != version:
+        return None, version
+    return body, version
+
+
+async def cache_post_list(viewer_id: int | None, field: str, body: bytes, version: str | None):
+    """Store a serialized page stamped with the version read before building it."""
+    if version is None:
+        return
+    key = _post_list_cache_key(viewer_id)
+    try:
+        redis = await get_redis()
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, field, f'{version}:'.encode() + body)
+            pipe.expire(key, FEED_CACHE_TTL_SECONDS)
+            await pipe.execute()
+    except RedisError:
+        logger.warning('Post list cache write failed', exc_info=True)
+
+
+async def invalidate_post_lists(viewer_id: int):
+    """Drop a viewer's cached pages after they post or like. Call after commit."""
+    try:
+        redis = await get_redis()
+        await redis.delete(_post_list_cache_key(viewer_id))
+    except RedisError:
+        logger.warning('Post list cache invalidation failed', exc_info=True)
+
+
+async def invalidate_all_post_lists():
+    """Make every viewer's cached pages stale, after a post is deleted or hidden. Call after commit."""
+    try:
+        redis = await get_redis()
+        await redis.incr(POST_LISTS_VERSION_KEY)
+    except RedisError:
+        logger.warning('Post list cache version bump failed', exc_info=True)
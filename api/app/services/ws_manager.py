@@ -1,7 +1,25 @@
 """WebSocket connection manager for real-time chat."""
+import asyncio
+import json
+import logging
+
 from fastapi import WebSocket
 from collections import defaultdict
 
+logger = logging.getLogger(__name__)
+
+
+# Frames buffered per connection; a socket that falls this far behind is closed
+OUTBOX_SIZE = 64
+
+# Tabs/devices per user; beyond this the oldest socket is closed so reconnect storms can't pile up
+MAX_CONNECTIONS_PER_USER = 10
+
+
+def _encode(message: dict) -> str:
+    """Serialize a message the same way Starlette's send_json does."""
+    return json.dumps(message, separators=(',', ':'), ensure_ascii=False)
+
 
 class ConnectionManager:
     """Manages WebSocket connections per user."""
@@ -9,12 +27,32 @@ class ConnectionManager:
     def __init__(self):
         # user_id -> list of WebSocket connections (user can have multiple tabs/devices)
         self.active_connections: dict[int, list[WebSocket]] = defaultdict(list)
+        # Each connection gets a bounded outbox drained by its own writer task, so
+        # senders never wait on a socket and a slow client only holds OUTBOX_SIZE frames
+        self._outboxes: dict[WebSocket, asyncio.Queue[str]] = {}
+        self._writers: dict[WebSocket, asyncio.Task] = {}
+
+    async def stop(self):
+        """Cancel all writer tasks. Call from app shutdown."""
+        writers = list(self._writers.values())
+        for task in writers:
+            task.cancel()
+        await asyncio.gather(*writers, return_exceptions=True)
+        self._writers.clear()
+        self._outboxes.clear()
 
     async def connect(self, websocket: WebSocket, user_id: int):
         """Accept and register a new connection."""
         await websocket.accept()
-        self.active_connections[user_id].append(websocket)
-        print(f'[WS] User {user_id} connected. Total connections: {len(self.active_connections[user_id])}')
+        connections = self.active_connections[user_id]
+        connections.append(websocket)
+        outbox: asyncio.Queue[str] = asyncio.Queue(maxsize=OUTBOX_SIZE)
+        self._outboxes[websocket] = outbox
+        self._writers[websocket] = asyncio.create_task(self._writer(websocket, user_id, outbox))
+        if len(connections) > MAX_CONNECTIONS_PER_USER:
+            logger.info('User %d over %d connections, closing oldest', user_id, MAX_CONNECTIONS_PER_USER)
+            await self._close(connections[0], user_id)
+        logger.info('User %d connected. Total connections: %d', user_id, len(connections))
 
     def disconnect(self, websocket: WebSocket, user_id: int):
         """Remove a connection."""
@@ -22,33 +60,72 @@ class ConnectionManager:
             self.active_connections[user_id].remove(websocket)
         if not self.active_connections[user_id]:
             del self.active_connections[user_id]
-        print(f'[WS] User {user_id} disconnected. Remaining: {len(self.active_connections.get(user_id, []))}')
+        self._outboxes.pop(websocket, None)
+        writer = self._writers.pop(websocket, None)
+        if writer and writer is not asyncio.current_task():
+            writer.cancel()
+        logger.info('User %d disconnected. Remaining: %d', user_id, len(self.active_connections.get(user_id, ())))
 
     async def send_to_user(self, user_id: int, message: dict):
         """Send a message to all connections of a specific user."""
         if user_id in self.active_connections:
-            print(f'[WS] Sending to user {user_id} ({len(self.active_connections[user_id])} connections)')
-            dead_connections = []
-            for connection in self.active_connections[user_id]:
-                try:
-                    await connection.send_json(message)
-                    print(f'[WS] Sent to user {user_id} successfully')
-                except Exception as e:
-                    print(f'[WS] Failed to send to user {user_id}: {e}')
-                    dead_connections.append(connection)
-            # Clean up dead connections
-            for conn in dead_connections:
-                self.disconnect(conn, user_id)
+            logger.debug('Sending to user %d (%d connections)', user_id, len(self.active_connections[user_id]))
+            data = _encode(message)
+            for ws in list(self.active_connections[user_id]):
+                await self._enqueue(ws, user_id, data)
         else:
-            print(f'[WS] User {user_id} has no active connections')
+            logger.debug('User %d has no active connections', user_id)
 
     async def broadcast_to_session(self, session_member_ids: list[int], message: dict, exclude_user: int | None = None):
         """Broadcast a message to all members of a chat session."""
-        print(f'[WS] Broadcasting to session members: {session_member_ids} (excluding {exclude_user})')
-        for user_id in session_member_ids:
-            if exclude_user and user_id == exclude_user:
-                continue
-            await self.send_to_user(user_id, message)
+        logger.debug('Broadcasting to %d session members (excluding %s)', len(session_member_ids), exclude_user)
+        targets = [
+            (user_id, ws)
+            for user_id in session_member_ids
+            if not (exclude_user and user_id == exclude_user)
+            for ws in self.active_connections.get(user_id, ())
+        ]
+        if not targets:
+            return
+        # Serialize once; every outbox gets the same str object
+        data = _encode(message)
+        for user_id, ws in targets:
+            await self._enqueue(ws, user_id, data)
+
+    async def _enqueue(self, websocket: WebSocket, user_id: int, data: str):
+        """Queue a frame without waiting on the socket; close the socket if its outbox is full."""
+        outbox = self._outboxes.get(websocket)
+        if outbox is None:
+            return
+        if outbox.full():
+            # Let writers run once: a burst within one loop turn shouldn't cost a healthy socket
+            await asyncio.sleep(0)
+        try:
+            outbox.put_nowait(data)
+        except asyncio.QueueFull:
+            # Dropping frames would leave silent gaps in the chat; closing makes the
+            # client reconnect and reload instead
+            logger.warning('Outbox full for user %d, closing slow connection', user_id)
+            await self._close(websocket, user_id)
+
+    async def _close(self, websocket: WebSocket, user_id: int):
+        self.disconnect(websocket, user_id)
+        try:
+            await websocket.close(code=1008)
+        except Exception as e:
+            # Usually already gone; the connection is deregistered either way
+            logger.debug('Failed to close socket for user %d: %s', user_id, e)
+
+    async def _writer(self, websocket: WebSocket, user_id: int, outbox: asyncio.Queue[str]):
+        """Drain one connection's outbox in order."""
+        while True:
+            data = await outbox.get()
+            try:
+                await websocket.send_text(data)
+            except Exception as e:
+                logger.warning('Failed to send to user %d: %s', user_id, e)
+                self.disconnect(websocket, user_id)
+                return
 
 
 # Singleton instance
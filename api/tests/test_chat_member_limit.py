@@ -0,0 +1,66 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.models.user import User
+
+
+async def _make_users(db_session, count: int) -> list[int]:
+    users = [User(name=f'Member {i}', handle=f'm{i}_{uuid.uuid4().hex[:8]}') for i in range(count)]
+    db_session.add_all(users)
+    await db_session.commit()
+    return [u.id for u in users]
+
+
+async def _group_with_limit(client, owner_id: int, member_ids: list[int], limit: int) -> int:
+    response = await client.post(
+        '/api/chat/sessions', params={'creator_id': owner_id},
+        json={'member_ids': member_ids, 'is_group': True, 'name': 'Limited'},
+    )
+    assert response.status_code == 201
+    session_id = response.json()['id']
+
+    response = await client.patch(
+        f'/api/chat/sessions/{session_id}', params={'user_id': owner_id},
+        json={'member_limit': limit},
+    )
+    assert response.status_code == 200
+    return session_id
+
+
+@pytest.mark.asyncio
+async def test_add_members_respects_member_limit(client, db_session):
+    owner, first, second, third = await _make_users(db_session, 4)
+    session_id = await _group_with_limit(client, owner, [first], limit=3)
+    url = f'/api/chat/sessions/{session_id}/members'
+
+    # Two more would make four
+    response = await client.post(url, params={'user_id': owner}, json={'user_ids': [second, third]})
+    assert response.status_code == 400
+    assert 'Member limit (3)' in response.json()['detail']
+
+    response = await client.post(url, params={'user_id': owner}, json={'user_ids': [second]})
+    assert response.status_code == 200
+    assert response.json() == {'added': 1}
+
+    response = await client.post(url, params={'user_id': owner}, json={'user_ids': [third]})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_concurrent_adds_cannot_overshoot_member_limit(client, db_session):
+    """One seat left and two requests racing for it: the session lock lets only one in."""
+    owner, first, second, third = await _make_users(db_session, 4)
+    session_id = await _group_with_limit(client, owner, [first], limit=3)
+    url = f'/api/chat/sessions/{session_id}/members'
+
+    responses = await asyncio.gather(
+        client.post(url, params={'user_id': owner}, json={'user_ids': [second]}),
+        client.post(url, params={'user_id': owner}, json={'user_ids': [third]}),
+    )
+    assert sorted(r.status_code for r in responses) == [200, 400]
+
+    detail = await client.get(f'/api/chat/sessions/{session_id}/detail', params={'user_id': owner})
+    assert detail.status_code == 200
+    assert detail.json()['member_count'] == 3
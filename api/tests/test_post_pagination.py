@@ -0,0 +1,110 @@
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.models.post import Comment, InteractionStatus, Post
+from app.models.user import User
+
+# Every row shares one timestamp, so only the id tie-breaker orders them
+TIED_CREATED_AT = datetime(2024, 1, 1, 12, 0, 0)
+
+
+async def _make_author(db_session) -> User:
+    user = User(name='Pager', handle=f'pager_{uuid.uuid4().hex[:8]}')
+    db_session.add(user)
+    await db_session.flush()
+    return user
+
+
+async def _page_through(client, url: str, params: dict) -> list[int]:
+    """Follow '{created_at}_{id}' cursors until an empty page; return the ids seen."""
+    seen = []
+    cursor = None
+    while True:
+        page_params = {**params, 'cursor': cursor} if cursor else params
+        response = await client.get(url, params=page_params)
+        assert response.status_code == 200
+        page = response.json()
+        if not page:
+            return seen
+        seen.extend(item['id'] for item in page)
+        cursor = f"{page[-1]['created_at']}_{page[-1]['id']}"
+
+
+@pytest.mark.asyncio
+async def test_post_cursor_breaks_created_at_ties_by_id(client, db_session):
+    """Posts with equal created_at page newest-id first, none skipped or repeated."""
+    author = await _make_author(db_session)
+    posts = [
+        Post(author_id=author.id, content=f'post {i}', created_at=TIED_CREATED_AT)
+        for i in range(5)
+    ]
+    db_session.add_all(posts)
+    await db_session.commit()
+
+    seen = await _page_through(client, '/api/posts', {'author_id': author.id, 'limit': 2})
+    assert seen == sorted((p.id for p in posts), reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_comment_cursor_breaks_created_at_ties_by_id(client, db_session):
+    """Comments with equal created_at page oldest-id first, none skipped or repeated."""
+    author = await _make_author(db_session)
+    post = Post(author_id=author.id, content='thread')
+    db_session.add(post)
+    await db_session.flush()
+    comments = [
+        Comment(
+            post_id=post.id, author_id=author.id, content=f'comment {i}',
+            interaction_status=InteractionStatus.SETTLED.value,
+            created_at=TIED_CREATED_AT,
+        )
+        for i in range(5)
+    ]
+    db_session.add_all(comments)
+    await db_session.commit()
+
+    seen = await _page_through(client, f'/api/posts/{post.id}/comments', {'limit': 2})
+    assert seen == sorted(c.id for c in comments)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('cursor', ['garbage', 'not-a-date_5', '2024-01-01T12:00:00_x'])
+async def test_invalid_cursor_rejected(client, db_session, cursor):
+    author = await _make_author(db_session)
+    post = Post(author_id=author.id, content='thread')
+    db_session.add(post)
+    await db_session.commit()
+
+    response = await client.get('/api/posts', params={'cursor': cursor})
+    assert response.status_code == 400
+    assert response.json()['detail'] == 'Invalid cursor'
+
+    response = await client.get(f'/api/posts/{post.id}/comments', params={'cursor': cursor})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_post_list_shows_edit(client, db_session):
+    """An edit reaches list pages served from the cache, for the author and everyone else."""
+    author = await _make_author(db_session)
+    post = Post(author_id=author.id, content='before')
+    db_session.add(post)
+    await db_session.commit()
+
+    params = {'author_id': author.id}
+    for viewer in (None, author.id):
+        viewer_params = {**params, 'user_id': viewer} if viewer else params
+        response = await client.get('/api/posts', params=viewer_params)
+        assert [p['content'] for p in response.json()] == ['before']
+
+    response = await client.patch(
+        f'/api/posts/{post.id}', params={'author_id': author.id}, json={'content': 'after'},
+    )
+    assert response.status_code == 200
+
+    for viewer in (None, author.id):
+        viewer_params = {**params, 'user_id': viewer} if viewer else params
+        response = await client.get('/api/posts', params=viewer_params)
+        assert [p['content'] for p in response.json()] == ['after']
@@ -11,12 +11,13 @@ Validates:
 7. Multi-liker equal share distribution
 8. Post deletion: pool forfeited to platform, author earnings clawed back
 9. Break-even math: liker at position k recoups at ~2.5k total likes
+10. Batched 24h-lock settlement matches per-item settle_locked()
 
 Run: cd api && python -m pytest tests/test_reward_distribution.py -v
 """
 import pytest
 import pytest_asyncio
-from datetime import date
+from datetime import date, datetime, timedelta
 from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.pool import NullPool
@@ -25,8 +26,11 @@ from app.db.database import Base
 from app.config import settings
 from app.models.user import User
 from app.models.post import Post, PostLike, Comment, CommentLike, InteractionStatus
-from app.models.ledger import Ledger
+from app.models.ledger import Ledger, ActionType, RefType
 from app.models.revenue import PlatformRevenue
+from app.services import interaction_settlement_service
+from app.services.interaction_settlement_service import InteractionSettlementService
+from app.services.ledger_service import LedgerService, CREATOR_SHARE
 from app.services.dynamic_like_service import (
     DynamicLikeService, like_cost, comment_like_cost,
     AUTHOR_SHARE, EARLY_LIKER_SHARE, PLATFORM_SHARE,
@@ -545,3 +549,155 @@ class TestLedgerIntegrity:
         )
         dividend_entries = list(result.scalars().all())
         assert len(dividend_entries) >= 2
+
+
+# ── Batched 24h-lock settlement ──────────────────────────────────────────────
+
+async def platform_revenue_today(db: AsyncSession) -> tuple[int, int, int]:
+    row = (await db.execute(
+        select(PlatformRevenue.like_revenue, PlatformRevenue.comment_revenue, PlatformRevenue.total)
+        .where(PlatformRevenue.date == date.today())
+    )).one_or_none()
+    return tuple(row) if row else (0, 0, 0)
+
+
+async def settle_entries(db: AsyncSession, user_id: int) -> list[tuple[int, int]]:
+    """(amount, balance_after) of a user's SETTLE_AUTHOR ledger rows, oldest first."""
+    result = await db.execute(
+        select(Ledger.amount, Ledger.balance_after)
+        .where(Ledger.user_id == user_id, Ledger.action_type == ActionType.SETTLE_AUTHOR.value)
+        .order_by(Ledger.id)
+    )
+    return [tuple(row) for row in result.all()]
+
+
+@pytest.mark.asyncio
+class TestSettleLockedBatch:
+    """settle_locked_batch() credits, logs and splits exactly like settle_locked() per item."""
+
+    async def test_repeated_recipient_balance_after(self, db):
+        author = await make_user(db, 'author', balance=1_000)
+        other = await make_user(db, 'other', balance=0)
+
+        await LedgerService(db).settle_locked_batch([
+            (100, author.id, RefType.POST_LIKE, 1, 'like'),
+            (50, other.id, RefType.POST_LIKE, 2, 'like'),
+            (37, author.id, RefType.COMMENT, 3, 'comment'),
+            (10, author.id, RefType.POST_LIKE, 4, 'like'),
+        ])
+        await db.commit()
+
+        expected = []
+        running = 1_000
+        for amount in (100, 37, 10):
+            share = int(amount * CREATOR_SHARE)
+            running += share
+            expected.append((share, running))
+        assert await settle_entries(db, author.id) == expected
+
+        await db.refresh(author)
+        await db.refresh(other)
+        assert author.available_balance == running
+        assert other.available_balance == int(50 * CREATOR_SHARE)
+
+    async def test_matches_per_item_settlement(self, db):
+        """Same items against two pairs of recipients: one at a time, then batched."""
+        items = [
+            (100, 0, RefType.POST_LIKE, 1, 'like'),
+            (37, 1, RefType.COMMENT, 2, 'comment'),
+            (55, 0, RefType.POST_LIKE, 3, 'like'),
+            (9, 1, RefType.COMMENT_LIKE, 4, 'like'),
+            (23, 0, RefType.COMMENT, 5, 'comment'),
+        ]
+        single = [await make_user(db, f'single{i}', balance=500) for i in range(2)]
+        batched = [await make_user(db, f'batched{i}', balance=500) for i in range(2)]
+        ledger = LedgerService(db)
+
+        revenue_start = await platform_revenue_today(db)
+        for amount, idx, ref_type, ref_id, source in items:
+            await ledger.settle_locked(amount, single[idx].id, ref_type, ref_id, source)
+        revenue_single = await platform_revenue_today(db)
+
+        await ledger.settle_locked_batch([
+            (amount, batched[idx].id, ref_type, ref_id, source)
+            for amount, idx, ref_type, ref_id, source in items
+        ])
+        revenue_batched = await platform_revenue_today(db)
+        await db.commit()
+
+        single_revenue = [after - before for before, after in zip(revenue_start, revenue_single, strict=True)]
+        batched_revenue = [after - before for before, after in zip(revenue_single, revenue_batched, strict=True)]
+        assert batched_revenue == single_revenue
+        assert single_revenue[1] > 0, 'Comment items should reach comment_revenue'
+
+        for one, many in zip(single, batched, strict=True):
+            assert await settle_entries(db, many.id) == await settle_entries(db, one.id)
+            await db.refresh(one)
+            await db.refresh(many)
+            assert many.available_balance == one.available_balance
+
+    async def test_missing_recipient_rejected(self, db):
+        author = await make_user(db, 'author', balance=0)
+
+        with pytest.raises(ValueError):
+            await LedgerService(db).settle_locked_batch([
+                (100, author.id, RefType.POST_LIKE, 1, 'like'),
+                (100, author.id + 1_000, RefType.POST_LIKE, 2, 'like'),
+            ])
+
+
+@pytest.mark.asyncio
+class TestSettleExpiredInteractions:
+    """Expired pending likes are streamed, paid out and marked settled batch by batch."""
+
+    async def test_streams_expired_likes_across_batches(self, db, monkeypatch):
+        # Five expired rows in batches of two: three partitions, the last one short
+        monkeypatch.setattr(interaction_settlement_service, 'SETTLEMENT_BATCH_SIZE', 2)
+        author = await make_user(db, 'author', balance=0)
+        post = await make_post(db, author)
+        likers = [await make_user(db, f'liker{i}') for i in range(6)]
+        costs = [10, 20, 30, 40, 50]
+
+        expired = datetime.utcnow() - timedelta(hours=1)
+        for liker, cost in zip(likers[:5], costs, strict=True):
+            db.add(PostLike(
+                post_id=post.id, user_id=liker.id, cost_paid=cost,
+                status=InteractionStatus.PENDING.value, locked_until=expired,
+                recipient_id=author.id,
+            ))
+        db.add(PostLike(
+            post_id=post.id, user_id=likers[5].id, cost_paid=99,
+            status=InteractionStatus.PENDING.value,
+            locked_until=datetime.utcnow() + timedelta(hours=1),
+            recipient_id=author.id,
+        ))
+        await db.commit()
+
+        result = await InteractionSettlementService(db).settle_expired_post_likes()
+        await db.commit()
+
+        assert result == {'settled': 5, 'total_sats': sum(costs)}
+
+        statuses = dict((await db.execute(
+            select(PostLike.cost_paid, PostLike.status).where(PostLike.post_id == post.id)
+        )).all())
+        assert statuses == {
+            **dict.fromkeys(costs, InteractionStatus.SETTLED.value),
+            99: InteractionStatus.PENDING.value,
+        }
+
+        expected_balance = sum(int(cost * CREATOR_SHARE) for cost in costs)
+        await db.refresh(author)
+        assert author.available_balance == expected_balance
+
+        entries = await settle_entries(db, author.id)
+        assert len(entries) == 5
+        running = 0
+        for amount, balance_after in entries:
+            running += amount
+            assert balance_after == running
+        assert running == expected_balance
+
+        assert await platform_revenue_today(db) == (
+            sum(costs) - expected_balance, 0, sum(costs) - expected_balance,
+        )
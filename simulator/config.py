@@ -5,6 +5,7 @@ All parameters from SIMULATION_PARAMS.md
 
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from typing import Dict, List, Tuple
 
 
@@ -106,6 +107,8 @@ TIER_REWARD_MULTIPLIER = {
 }
 
 
+# Pure and hot (every user.trust_tier access); most users sit on a few repeated scores
+@lru_cache(maxsize=4096)
 def get_trust_tier(trust_score: float) -> TrustTier:
     for tier, (low, high) in TRUST_TIER_RANGES.items():
         if low <= trust_score <= high:
@@ -135,13 +138,27 @@ N_NOVELTY = [
 ]
 
 
-def get_n_novelty(interaction_count: int) -> float:
+# Interaction counts below this are looked up in a precomputed table
+N_NOVELTY_TABLE_SIZE = 1024
+
+
+def _n_novelty(interaction_count: int) -> float:
     for threshold, value in N_NOVELTY:
         if interaction_count <= threshold:
             return value
     return 0.05
 
 
+# Called for every like; index a table instead of scanning the thresholds
+_N_NOVELTY_TABLE = tuple(_n_novelty(n) for n in range(N_NOVELTY_TABLE_SIZE))
+
+
+def get_n_novelty(interaction_count: int) -> float:
+    if 0 <= interaction_count < N_NOVELTY_TABLE_SIZE:
+        return _N_NOVELTY_TABLE[interaction_count]
+    return _n_novelty(interaction_count)
+
+
 S_SOURCE = {
     'stranger': 1.00,
     'follower': 0.15,
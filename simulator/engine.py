@@ -3,6 +3,7 @@ BitLink Economic Simulator - Core Engine
 Handles fees, rewards, discovery score calculation
 """
 
+import heapq
 import random
 import uuid
 from typing import List, Dict, Optional, Tuple
@@ -79,12 +80,13 @@ class EconomicEngine:
         if user.id in self._circle_cache:
             return self._circle_cache[user.id]
         
-        sorted_interactions = sorted(
+        # Only the top N are needed; nlargest avoids sorting the whole history
+        top_interactions = heapq.nlargest(
+            CIRCLE_SIZE,
             user.interaction_history.items(),
             key=lambda x: x[1],
-            reverse=True
         )
-        circle = set([uid for uid, count in sorted_interactions[:CIRCLE_SIZE]])
+        circle = set([uid for uid, count in top_interactions])
         self._circle_cache[user.id] = circle
         return circle
     
@@ -101,15 +103,14 @@ class EconomicEngine:
             return 0.0
         
         # Get top N interactors
-        sorted_interactions = sorted(
-            user.interaction_history.items(),
-            key=lambda x: x[1],
-            reverse=True
+        top_interactions = heapq.nlargest(
+            CIRCLE_SIZE,
+            user.interaction_history.values(),
         )
         
         # Calculate interaction concentration in top N
-        top_n = min(CIRCLE_SIZE, len(sorted_interactions))
-        circle_interactions = sum(count for _, count in sorted_interactions[:top_n])
+        top_n = len(top_interactions)
+        circle_interactions = sum(top_interactions)
         
         concentration = circle_interactions / total_interactions
         
@@ -6,6 +6,7 @@ User, Post, Like, Challenge entities
 from dataclasses import dataclass, field
 from typing import List, Dict, Set, Optional
 from enum import Enum
+from functools import lru_cache
 import random
 import uuid
 
@@ -15,6 +16,27 @@ from config import (
 )
 
 
+# Keyed on the four dimension values, so direct writes to the fields need no
+# invalidation; scores repeat across the many trust_score reads between changes
+@lru_cache(maxsize=65536)
+def _trust_score(creator: float, curator: float, juror: float, risk: float) -> float:
+    base = creator * 0.6 + curator * 0.3
+    juror_bonus = max(0, (juror - 300) * 0.1)
+
+    # Risk penalty: exponential for high risk users
+    # risk < 50: mild penalty
+    # risk 50-100: moderate penalty  
+    # risk > 100: severe penalty (cabal/violators)
+    if risk <= 50:
+        risk_penalty = risk * 0.5  # max 25
+    elif risk <= 100:
+        risk_penalty = 25 + (risk - 50) * 2  # 25 + up to 100 = 125
+    else:
+        risk_penalty = 125 + (risk - 100) * 5  # severe: 5 per point above 100
+
+    return max(0, base + juror_bonus - risk_penalty)
+
+
 @dataclass
 class ReputationScores:
     """
@@ -46,21 +68,7 @@ class ReputationScores:
         无硬顶，可突破 1000
         Risk 惩罚采用分段设计：低风险影响小，高风险惩罚重
         """
-        base = self.creator * 0.6 + self.curator * 0.3
-        juror_bonus = max(0, (self.juror - 300) * 0.1)
-        
-        # Risk penalty: exponential for high risk users
-        # risk < 50: mild penalty
-        # risk 50-100: moderate penalty  
-        # risk > 100: severe penalty (cabal/violators)
-        if self.risk <= 50:
-            risk_penalty = self.risk * 0.5  # max 25
-        elif self.risk <= 100:
-            risk_penalty = 25 + (self.risk - 50) * 2  # 25 + up to 100 = 125
-        else:
-            risk_penalty = 125 + (self.risk - 100) * 5  # severe: 5 per point above 100
-        
-        return max(0, base + juror_bonus - risk_penalty)
+        return _trust_score(self.creator, self.curator, self.juror, self.risk)
     
     def apply_change(self, dimension: str, change: float, tier_multiplier: float = 1.0):
         """
@@ -336,9 +344,17 @@ class Content:
     likes: List[Like] = field(default_factory=list)
     comments: List[str] = field(default_factory=list)  # List of comment IDs
     
+    # Running sum of like.weight; likes never change once added (see add_like)
+    like_weight_total: float = 0.0
+    
     # Parent (for comments/replies/answers)
     parent_id: Optional[str] = None
     
+    def add_like(self, like: Like) -> None:
+        """Append a like and fold its weight into like_weight_total"""
+        self.likes.append(like)
+        self.like_weight_total += like.weight
+    
     @property
     def discovery_score(self) -> float:
         """
@@ -351,7 +367,7 @@ class Content:
             return 0.0
         
         # Base score from like weights
-        base_score = sum(like.weight for like in self.likes)
+        base_score = self.like_weight_total
         
         # Diminishing returns for popular content
         n = len(self.likes)
@@ -210,8 +210,8 @@ def calculate_discovery_score(content: 'Content', state: 'SimulationState', curr
     if not likes:
         return 0.0
     
-    # Base: sum of weighted likes
-    base_score = sum(like.weight for like in likes)
+    # Base: sum of weighted likes, accumulated as they were added
+    base_score = content.like_weight_total
     
     # Apply inferred quality as multiplier
     inferred_quality = get_inferred_quality(content, state, current_day)
@@ -476,10 +476,9 @@ def distribute_quality_subsidy(
     # Calculate total density for proportional distribution
     total_density = sum(density for _, density in underrated)
     
-    # Sort by density to find top 10%
-    underrated_sorted = sorted(underrated, key=lambda x: -x[1])
-    top_10_pct_cutoff = len(underrated_sorted) // 10 if len(underrated_sorted) >= 10 else 1
-    top_10_pct_ids = {c.id for c, _ in underrated_sorted[:top_10_pct_cutoff]}
+    # Top 10% by density (identify_underrated_content already returns them highest first)
+    top_10_pct_cutoff = len(underrated) // 10 if len(underrated) >= 10 else 1
+    top_10_pct_ids = {c.id for c, _ in underrated[:top_10_pct_cutoff]}
     
     # Import for reputation events
     import random
@@ -527,7 +527,7 @@ class BitLinkSimulator:
             cross_circle_mult=cross_circle_mult,
         )
         
-        content.likes.append(like)
+        content.add_like(like)
         user.likes_given += 1
         user.reputation.record_like()  # 行为证明
         user.record_interaction(author.id)